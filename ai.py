@@ -0,0 +1,184 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import *
+from simulation import Body, create_simulation
+
+SCORE_WIN = 1000
+SCORE_OWN_BALL = 10
+SCORE_OPPONENT_BALL = -8
+SCORE_KEEP_TURN = 5
+SCORE_FOUL = -50
+
+
+def snapshot_balls(balls):
+    """Keadaan meja yang bisa di-pickle: tuple (nomor, x, y, potted) per bola."""
+    return tuple((b.number, b.pos.x, b.pos.y, b.potted) for b in balls)
+
+
+def group_numbers(assignment):
+    return range(1, 8) if assignment == "solid" else range(9, 16)
+
+
+def score_shot(potted, assignment, remaining):
+    """
+    Menilai hasil satu tembakan mengikuti aturan di GameManager.handle_pot / switch_turn.
+    potted: nomor bola yang masuk berurutan; assignment: jenis bola pemain (None = meja terbuka);
+    remaining: nomor bola yang masih di meja sebelum tembakan.
+    Mengembalikan (skor, pemain_masih_jalan).
+    """
+    score = 0
+    keeps_turn = False
+    remaining = set(remaining)
+    for number in potted:
+        remaining.discard(number)
+        if number == 0:
+            score += SCORE_FOUL
+            keeps_turn = False
+        elif number == 8:
+            if assignment and not any(n in remaining for n in group_numbers(assignment)):
+                return SCORE_WIN, True
+            return -SCORE_WIN, False
+        else:
+            kind = "solid" if number < 8 else "stripe"
+            if assignment is None:
+                assignment = kind
+            if kind == assignment:
+                score += SCORE_OWN_BALL
+                keeps_turn = True
+            else:
+                score += SCORE_OPPONENT_BALL
+                keeps_turn = False
+    if keeps_turn:
+        score += SCORE_KEEP_TURN
+    return score, keeps_turn
+
+
+def evaluate_shots(state, shots):
+    """
+    Worker: mensimulasikan setiap (sudut, power) sampai diam tanpa pygame.
+    Dijalankan di proses terpisah, jadi semua argumen dan hasilnya harus bisa di-pickle.
+    Kandidat yang belum diam setelah AI_MAX_EVENTS / AI_MAX_FRAMES dianggap tidak valid
+    dan tidak masuk hasil, agar satu kasus degeneratif tidak menahan worker.
+    """
+    snapshot, bounds, pockets, assignment, mode = state
+    remaining = [n for n, _, _, potted in snapshot if not potted and n != 0]
+    results = []
+    for angle, power in shots:
+        balls = []
+        for number, x, y, potted in snapshot:
+            body = Body(x, y, number)
+            body.potted = potted
+            balls.append(body)
+        sim = create_simulation(balls, bounds, pockets, mode=mode)
+        potted = []
+        sim.on_pot = lambda ball: potted.append(ball.number)
+        sim.strike(balls[0], power, angle)
+        if mode == "event": sim.run_until_rest(max_events=AI_MAX_EVENTS)
+        else: sim.run_until_rest(max_frames=AI_MAX_FRAMES)
+        if sim.is_moving(): continue
+        score, _ = score_shot(potted, assignment, remaining)
+        results.append((score, angle, power))
+    return results
+
+
+class ShotPlanner:
+    """
+    Lawan komputer berbasis pencarian Monte Carlo.
+    Kandidat tembakan (sudut, power) dibagi per batch ke ProcessPoolExecutor dan dinilai
+    terhadap aturan 8-ball. poll() dipanggil sekali per frame dan tidak pernah menunggu,
+    sehingga UI tetap 60 FPS selama komputer "berpikir".
+    """
+
+    def __init__(self, time_budget=AI_TIME_BUDGET, workers=AI_WORKERS, batch_size=AI_BATCH_SIZE):
+        self.time_budget = time_budget
+        self.workers = workers or max(1, multiprocessing.cpu_count() - 1)
+        self.batch_size = batch_size
+        self.executor = None
+        self.rng = random.Random()
+        self.cancel()
+
+    def start(self, balls, bounds, pockets, assignment):
+        """Memulai pencarian tembakan untuk keadaan meja saat ini."""
+        self.cancel()
+        self.state = (snapshot_balls(balls), bounds, pockets, assignment, AI_PHYSICS_MODE)
+        self.targets = [(b.pos.x, b.pos.y) for b in balls
+                        if not b.potted and b.number != 0 and (assignment is None or b.type in (assignment, "eight"))]
+        self.cue_pos = (balls[0].pos.x, balls[0].pos.y)
+        self.deadline = time.perf_counter() + self.time_budget
+        self.active = True
+        if self.executor is None:
+            # "spawn" agar worker tidak mewarisi state SDL/pygame dari proses utama
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def poll(self):
+        """Mengambil hasil batch yang selesai dan mengirim batch baru. Mengembalikan (sudut, power) jika selesai."""
+        if not self.active: return None
+
+        for future in [f for f in self.pending if f.done()]:
+            self.pending.remove(future)
+            if future.cancelled() or future.exception(): continue
+            for result in future.result():
+                self.evaluated += 1
+                if self.best is None or result[0] > self.best[0]:
+                    self.best = result
+
+        now = time.perf_counter()
+        if now < self.deadline:
+            try:
+                while len(self.pending) < self.workers * 2:
+                    self.pending.append(self.executor.submit(evaluate_shots, self.state, self._sample(self.batch_size)))
+                return None
+            except Exception as e:
+                # Pool rusak (mis. worker mati): pakai hasil terbaik yang sudah ada
+                print(f"AI worker gagal: {e}")
+                self.executor = None
+                self.deadline = now
+
+        if self.pending and now < self.deadline + self.time_budget:
+            return None
+        choice = self.best or (0, self.rng.uniform(-math.pi, math.pi), self.rng.uniform(5, MAX_SHOT_POWER))
+        self.cancel()
+        return choice[1], choice[2]
+
+    def best_angle(self):
+        return self.best[1] if self.best else None
+
+    def cancel(self):
+        for future in getattr(self, "pending", []):
+            future.cancel()
+        self.pending = []
+        self.best = None
+        self.evaluated = 0
+        self.active = False
+
+    def shutdown(self):
+        """
+        Menghentikan pool tanpa menunggu. Batch yang belum mulai dibatalkan; batch yang sedang
+        berjalan paling lama satu batch, karena tiap kandidat dibatasi AI_MAX_EVENTS / AI_MAX_FRAMES.
+        """
+        self.cancel()
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _sample(self, count):
+        """Setengah kandidat dibidik ke bola sasaran, sisanya acak; sekitar tembakan terbaik jika sudah ada."""
+        shots = []
+        cx, cy = self.cue_pos
+        for _ in range(count):
+            roll = self.rng.random()
+            if self.best and roll < 0.3:
+                angle = self.best[1] + self.rng.gauss(0, 0.02)
+                power = min(max(self.best[2] + self.rng.gauss(0, 1.5), 2), MAX_SHOT_POWER)
+            elif self.targets and roll < 0.7:
+                tx, ty = self.rng.choice(self.targets)
+                angle = math.atan2(ty - cy, tx - cx) + self.rng.gauss(0, 0.04)
+                power = self.rng.uniform(5, MAX_SHOT_POWER)
+            else:
+                angle = self.rng.uniform(-math.pi, math.pi)
+                power = self.rng.uniform(3, MAX_SHOT_POWER)
+            shots.append((angle, power))
+        return shots
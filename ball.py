@@ -1,66 +1,20 @@
 import pygame
 import math
 from config import *
+from simulation import ball_type
 
 class Ball:
+    __slots__ = ("pos", "velocity", "radius", "color", "friction", "potted", "number", "type")
+
     def __init__(self, x, y, color, number=0):
         self.pos = pygame.math.Vector2(x, y)
         self.velocity = pygame.math.Vector2(0, 0)
         self.radius = BALL_RADIUS
         self.color = color
-        self.friction = 0.99
+        self.friction = BALL_FRICTION
         self.potted = False
         self.number = number
-        
-        if number == 0: self.type = "cue"
-        elif number == 8: self.type = "eight"
-        elif 1 <= number <= 7: self.type = "solid"
-        else: self.type = "stripe"
-
-    def update(self):
-        if self.potted: return
-
-        self.pos += self.velocity
-        
-        if self.velocity.length() > 0.05:
-            self.velocity *= self.friction
-        else:
-            self.velocity = pygame.math.Vector2(0, 0)
-
-    def check_wall_collision(self, table_rect):
-        if self.potted: return False
-        
-        collided = False
-        if self.pos.x - self.radius < table_rect.left:
-            self.pos.x = table_rect.left + self.radius
-            self.velocity.x *= -0.9
-            collided = True
-        elif self.pos.x + self.radius > table_rect.right:
-            self.pos.x = table_rect.right - self.radius
-            self.velocity.x *= -0.9
-            collided = True
-
-        if self.pos.y - self.radius < table_rect.top:
-            self.pos.y = table_rect.top + self.radius
-            self.velocity.y *= -0.9
-            collided = True
-        elif self.pos.y + self.radius > table_rect.bottom:
-            self.pos.y = table_rect.bottom - self.radius
-            self.velocity.y *= -0.9
-            collided = True
-            
-        return collided
-
-    def check_pocket_collision(self, pockets):
-        if self.potted: return False
-        for pocket in pockets:
-            dx = self.pos.x - pocket[0]
-            dy = self.pos.y - pocket[1]
-            if math.hypot(dx, dy) < POCKET_RADIUS:
-                self.potted = True
-                self.velocity = pygame.math.Vector2(0, 0)
-                return True
-        return False
+        self.type = ball_type(number)
 
     def draw(self, surface, font=None):
         if self.potted: return
@@ -83,19 +37,23 @@ class Ball:
         pygame.draw.circle(surface, (255, 255, 255), highlight_pos, 2)
 
 class CueBall(Ball):
+    __slots__ = ("original_pos",)
+
     def __init__(self, x, y):
         super().__init__(x, y, WHITE, 0)
         self.original_pos = (x, y)
 
     def reset(self):
-        self.pos = pygame.math.Vector2(self.original_pos)
-        self.velocity = pygame.math.Vector2(0, 0)
+        self.pos.update(self.original_pos)
+        self.velocity.update(0, 0)
         self.potted = False
 
     def hit(self, force, angle):
-        impulse = pygame.math.Vector2(math.cos(angle), math.sin(angle))
-        self.velocity += impulse * force
+        self.velocity.x += math.cos(angle) * force
+        self.velocity.y += math.sin(angle) * force
 
 class ObjectBall(Ball):
+    __slots__ = ()
+
     def __init__(self, x, y, color, number):
         super().__init__(x, y, color, number)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Benchmark waktu per frame terhadap jumlah bola (16 s.d. 2000) pada meja sandbox.
+
+Menjalankan:
+    python benchmarks/broadphase_bench.py [--frames 10] [--counts 16,100,500,2000]
+
+Mode yang dibandingkan:
+    all-pairs   : backend Python, loop O(n^2)
+    grid        : backend Python + SpatialHash
+    numpy       : backend NumPy, satu pass jarak untuk semua pasangan
+    numpy+sap   : backend NumPy + sweep-and-prune
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulation
+from simulation import Body, Simulation, NumpySimulation
+
+# Di atas jumlah ini mode O(n^2) terlalu lama untuk dijalankan
+ALL_PAIRS_LIMIT = 500
+
+
+def sandbox_balls(count, seed=0):
+    """Bola tersebar acak di meja yang luasnya menyesuaikan jumlah bola."""
+    rnd = random.Random(seed)
+    width = int(math.sqrt(count * 1600 * 2)) + 100
+    height = width // 2
+    cols = (width - 40) // 25
+    balls = []
+    for k in range(count):
+        x = 20 + (k % cols) * 25 + rnd.random() * 3
+        y = 20 + (k // cols) * 25 + rnd.random() * 3
+        ball = Body(x, y, k % 16)
+        ball.velocity.x = rnd.uniform(-8, 8)
+        ball.velocity.y = rnd.uniform(-8, 8)
+        balls.append(ball)
+    return balls, (0, 0, width, height)
+
+
+def time_mode(cls, use_broadphase, count, frames):
+    simulation.BROADPHASE_MIN_BALLS = 0 if use_broadphase else 10 ** 9
+    balls, bounds = sandbox_balls(count)
+    sim = cls(balls, bounds=bounds, pockets=[])
+    sim.step()
+    start = time.perf_counter()
+    for _ in range(frames):
+        sim.step()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--counts", default="16,50,100,250,500,1000,2000")
+    args = parser.parse_args()
+
+    modes = [("all-pairs", Simulation, False), ("grid", Simulation, True)]
+    if simulation.np is not None:
+        modes += [("numpy", NumpySimulation, False), ("numpy+sap", NumpySimulation, True)]
+
+    print(f"{'balls':>6} " + " ".join(f"{name:>12}" for name, _, _ in modes) + "   (ms/frame)")
+    for count in [int(c) for c in args.counts.split(",")]:
+        row = []
+        for name, cls, use_broadphase in modes:
+            if not use_broadphase and count > ALL_PAIRS_LIMIT:
+                row.append(f"{'-':>12}")
+                continue
+            row.append(f"{time_mode(cls, use_broadphase, count, args.frames):>12.2f}")
+        print(f"{count:>6} " + " ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Suite benchmark mikro & makro: fisika, ray casting dan rendering (headless).
+
+Menjalankan:
+    python benchmarks/suite.py                          # jalankan semua, cetak tabel
+    python benchmarks/suite.py --save baseline.json     # simpan hasil sebagai baseline
+    python benchmarks/suite.py --compare baseline.json  # bandingkan; exit code 1 jika ada regresi
+    python benchmarks/suite.py --only ray_cast_ball,draw_game --samples 50
+
+Benchmark:
+    resolve_collision : PhysicsEngine.resolve_collision pada pasangan bola yang bertumbukan
+    ray_cast_ball     : PhysicsEngine.ray_cast_ball dari bola putih ke rack 15 bola, berbagai sudut
+    break_shot        : break penuh dari reset_game_objects sampai semua bola diam (update_game_logic)
+    cue_draw          : satu frame bidikan Cue.draw (ray cast + garis + sprite stik)
+    draw_game         : satu frame penuh draw_game
+
+Setiap sampel menjalankan `number` operasi; waktu per operasi dari semua sampel dipakai untuk
+ops/detik (median) dan persentil p50/p95/p99. Regresi = p50 lebih lambat dari baseline
+melebihi --threshold. Break shot memakai satu tick fisika per frame (last_update = None),
+jadi jumlah tick selalu sama di setiap mesin.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame # type: ignore
+import leaderboard
+import main
+from ball import CueBall, ObjectBall
+from config import *
+from physics import PhysicsEngine
+from profiler import percentile
+from simulation import rack_layout
+
+PERCENTILES = (50, 95, 99)
+
+
+class Benchmark:
+    """setup() (tidak diukur) mengembalikan fungsi tanpa argumen yang menjalankan `number` operasi."""
+
+    def __init__(self, name, setup, number, samples=None):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.samples = samples
+
+
+def run_benchmark(bench, samples, warmup=2):
+    samples = bench.samples or samples
+    times = []
+    for i in range(warmup + samples):
+        op = bench.setup()
+        start = time.perf_counter()
+        op()
+        elapsed = (time.perf_counter() - start) / bench.number
+        if i >= warmup: times.append(elapsed)
+
+    times.sort()
+    result = {f"p{p}_us": percentile(times, p) * 1e6 for p in PERCENTILES}
+    result["ops_per_sec"] = 1e6 / result["p50_us"]
+    result["samples"] = samples
+    result["number"] = bench.number
+    return result
+
+
+# --- Benchmark mikro ---
+
+def setup_resolve_collision(count=1000):
+    """Pasangan bola yang saling tumpang tindih dan mendekat (dibuat ulang per sampel karena dimutasi)."""
+    def setup():
+        pairs = []
+        for k in range(count):
+            angle = k * 2 * math.pi / count
+            a = ObjectBall(500, 300, WHITE, 1)
+            b = ObjectBall(500 + math.cos(angle) * BALL_RADIUS * 1.8, 300 + math.sin(angle) * BALL_RADIUS * 1.8, WHITE, 2)
+            a.velocity.update(math.cos(angle) * 5, math.sin(angle) * 5)
+            b.velocity.update(-math.cos(angle) * 3, -math.sin(angle) * 3)
+            pairs.append((a, b))
+
+        def op():
+            resolve = PhysicsEngine.resolve_collision
+            for a, b in pairs:
+                resolve(a, b)
+        return op
+    return setup
+
+
+def setup_ray_cast_ball(count=1000):
+    cue_ball = CueBall(TABLE_X + 200, TABLE_Y + PLAY_HEIGHT // 2)
+    balls = [ObjectBall(x, y, WHITE, num) for num, x, y in rack_layout(TABLE_X + 600, TABLE_Y + PLAY_HEIGHT // 2)]
+    # Sudut di sekitar rack (sebagian kena, sebagian lolos) ditambah arah merata ke seluruh meja
+    directions = [pygame.math.Vector2(math.cos(a), math.sin(a))
+                  for a in [(k / count - 0.5) * 0.6 if k % 2 else k * 2 * math.pi / count for k in range(count)]]
+
+    def setup():
+        def op():
+            cast = PhysicsEngine.ray_cast_ball
+            start = cue_ball.pos
+            for direction in directions:
+                cast(start, direction, balls)
+        return op
+    return setup
+
+
+# --- Benchmark makro (GameManager headless) ---
+
+def create_game():
+    # Backend JSON tanpa pertandingan selesai tidak menulis file apa pun
+    leaderboard.LEADERBOARD_BACKEND = "json"
+    game = main.GameManager()
+    game.sound_manager.enabled = False
+    game.state = STATE_PLAYING
+    return game
+
+
+def setup_break_shot(game):
+    def setup():
+        game.reset_game_objects()
+        game.state = STATE_PLAYING
+        game.cue.angle, game.cue.power, game.cue.state = 0.0, game.cue.max_power, 1
+        game.cue.handle_click()
+        game.is_moving = True
+
+        def op():
+            while game.is_moving and game.state == STATE_PLAYING:
+                game.last_update = None  # tepat satu tick per frame
+                game.update_game_logic((0, 0))
+        return op
+    return setup
+
+
+def aiming_game(game):
+    game.reset_game_objects()
+    game.state = STATE_PLAYING
+    game.message_timer = 0
+    return game
+
+
+def setup_cue_draw(game, count=100):
+    def setup():
+        aiming_game(game)
+        # Mouse bergerak: setiap frame sudut berbeda, jadi prediksi bidikan dihitung ulang
+        angles = [(k / count - 0.5) * 2 * math.pi for k in range(count)]
+
+        def op():
+            for angle in angles:
+                game.cue.angle = angle
+                game.cue.draw(game.screen, game.balls, game.table.rect, game.sim.version)
+        return op
+    return setup
+
+
+def setup_draw_game(game, count=20):
+    def setup():
+        aiming_game(game)
+
+        def op():
+            for _ in range(count):
+                game.draw_game((0, 0))
+        return op
+    return setup
+
+
+def build_suite(game):
+    return [
+        Benchmark("resolve_collision", setup_resolve_collision(), 1000),
+        Benchmark("ray_cast_ball", setup_ray_cast_ball(), 1000),
+        Benchmark("break_shot", setup_break_shot(game), 1, samples=10),
+        Benchmark("cue_draw", setup_cue_draw(game), 100),
+        Benchmark("draw_game", setup_draw_game(game), 20),
+    ]
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def format_time(us):
+    return f"{us / 1000:.2f} ms" if us >= 1000 else f"{us:.2f} us"
+
+
+def compare(results, baseline, threshold):
+    """Mengembalikan {nama: (rasio p50 sekarang / baseline, status)}."""
+    report = {}
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base: continue
+        ratio = result["p50_us"] / base["p50_us"]
+        if ratio > 1 + threshold: status = "REGRESI"
+        elif ratio < 1 - threshold: status = "lebih cepat"
+        else: status = "ok"
+        report[name] = (ratio, status)
+    return report
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=30, help="sampel per benchmark mikro/frame")
+    parser.add_argument("--only", default="", help="nama benchmark dipisah koma")
+    parser.add_argument("--save", metavar="FILE", help="simpan hasil sebagai baseline JSON")
+    parser.add_argument("--compare", metavar="FILE", help="bandingkan dengan baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="batas regresi p50 (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    game = create_game()
+    suite = build_suite(game)
+    if args.only:
+        names = set(args.only.split(","))
+        unknown = names - {bench.name for bench in suite}
+        if unknown: parser.error(f"benchmark tidak dikenal: {', '.join(sorted(unknown))}")
+        suite = [bench for bench in suite if bench.name in names]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'benchmark':<18} {'ops/s':>12} {'p50':>12} {'p95':>12} {'p99':>12}")
+    for bench in suite:
+        result = results[bench.name] = run_benchmark(bench, args.samples)
+        print(f"{bench.name:<18} {result['ops_per_sec']:>12.1f} "
+              + " ".join(f"{format_time(result[f'p{p}_us']):>12}" for p in PERCENTILES))
+
+    game.leaderboard.close()
+    game.ai.shutdown()
+
+    regressions = 0
+    if baseline:
+        print(f"\nDibandingkan dengan {args.compare} ({baseline.get('environment', {}).get('created', '?')}):")
+        for name, (ratio, status) in compare(results, baseline, args.threshold).items():
+            print(f"{name:<18} {ratio:>8.2f}x  {status}")
+            if status == "REGRESI": regressions += 1
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "threshold": args.threshold, "results": results}, f, indent=4)
+        print(f"\nBaseline disimpan ke {args.save}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
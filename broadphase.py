@@ -0,0 +1,111 @@
+from config import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SpatialHash:
+    """
+    Broadphase grid seragam untuk meja dengan banyak bola.
+    Ukuran sel = diameter bola, sehingga dua bola yang bersentuhan selalu berada
+    di sel yang sama atau di sel tetangga (3x3). Grid diperbarui secara inkremental:
+    hanya bola yang berpindah sel yang dipindahkan di dalam dict.
+    """
+
+    # Tetangga "ke depan" saja, agar setiap pasangan sel hanya diperiksa sekali
+    FORWARD_NEIGHBORS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, cell_size=BALL_RADIUS * 2):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.ball_cells = {}
+        self.populated = False
+
+    def update(self, balls, indices=None):
+        """
+        Menyinkronkan grid dengan posisi bola terbaru (bola potted dikeluarkan).
+        Jika `indices` diberikan, hanya bola tersebut yang diperiksa; bola lain dianggap diam.
+        """
+        size = self.cell_size
+        cells, ball_cells = self.cells, self.ball_cells
+        if indices is None or not self.populated:
+            # Pengisian pertama selalu penuh agar bola yang belum pernah bergerak ikut terdaftar
+            indices = range(len(balls))
+            self.populated = True
+        for index in indices:
+            ball = balls[index]
+            old = ball_cells.get(index)
+            if ball.potted:
+                if old is not None:
+                    self._remove(index, old)
+                    del ball_cells[index]
+                continue
+            new = (int(ball.pos.x // size), int(ball.pos.y // size))
+            if new == old: continue
+            if old is not None:
+                self._remove(index, old)
+            cells.setdefault(new, []).append(index)
+            ball_cells[index] = new
+
+    def candidate_pairs(self):
+        """Pasangan (i, j) dengan i < j yang mungkin bertumbukan, terurut seperti loop all-pairs."""
+        cells = self.cells
+        pairs = []
+        for (cx, cy), members in cells.items():
+            count = len(members)
+            for a in range(count):
+                for b in range(a + 1, count):
+                    pairs.append(self._ordered(members[a], members[b]))
+            for ox, oy in self.FORWARD_NEIGHBORS:
+                others = cells.get((cx + ox, cy + oy))
+                if not others: continue
+                for i in members:
+                    for j in others:
+                        pairs.append(self._ordered(i, j))
+        pairs.sort()
+        return pairs
+
+    def clear(self):
+        self.cells.clear()
+        self.ball_cells.clear()
+        self.populated = False
+
+    def _remove(self, index, cell):
+        members = self.cells[cell]
+        members.remove(index)
+        if not members:
+            del self.cells[cell]
+
+    @staticmethod
+    def _ordered(i, j):
+        return (i, j) if i < j else (j, i)
+
+
+def sweep_and_prune(pos, reach):
+    """
+    Broadphase sweep-and-prune sepanjang sumbu x untuk backend NumPy.
+    pos adalah array (n, 2), reach jarak tumbukan maksimum (2 x radius terbesar).
+    Mengembalikan dua array indeks (i, j) dengan i < j, terurut leksikografis.
+    """
+    order = np.argsort(pos[:, 0], kind='stable')
+    xs = pos[order, 0]
+    n = len(xs)
+    upper = np.searchsorted(xs, xs + reach, side='right')
+    counts = upper - np.arange(n) - 1
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    first = np.repeat(np.arange(n), counts)
+    starts = np.cumsum(counts) - counts
+    second = first + 1 + (np.arange(total) - np.repeat(starts, counts))
+
+    a, b = order[first], order[second]
+    close = np.abs(pos[a, 1] - pos[b, 1]) < reach
+    a, b = a[close], b[close]
+    i, j = np.minimum(a, b), np.maximum(a, b)
+    keys = np.lexsort((j, i))
+    return i[keys], j[keys]
@@ -1,8 +1,21 @@
-import pygame # type: ignore
-
 SCREEN_WIDTH = 1280 
 SCREEN_HEIGHT = 720
 FPS = 60
+IDLE_MODE = True  # tidur di event.wait saat tidak ada input/animasi
+IDLE_WAIT_MS = 500  # batas tunggu event saat idle
+PHYSICS_HZ = 60  # tick fisika per detik (satu tick = satu Simulation.step)
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_PHYSICS_TICKS = 8  # batas tick per frame render agar tidak terjebak mengejar
+MAX_FRAME_TIME = 0.25  # detik; jeda lebih lama dari ini tidak dikejar
+TURBO_MODE = False  # True = fisika berjalan secepat CPU (replay cepat / pengujian)
+TURBO_FRAME_BUDGET = 0.012  # detik fisika per frame render saat turbo
+
+SAMPLE_RATE = 44100
+SOUND_CHANNELS = 4  # channel mixer yang dicadangkan untuk efek suara
+SOUND_MIN_INTERVAL = 0.05  # detik minimum antar suara sejenis
+SOUND_FULL_IMPACT = 15  # kecepatan tumbukan untuk volume penuh
+SOUND_MIN_VOLUME = 0.2
+SOUND_CACHE_DIR = "sound_cache"  # buffer PCM hasil sintesis (boleh dihapus, dibuat ulang otomatis)
 
 PLAY_WIDTH = 800
 PLAY_HEIGHT = 400
@@ -13,6 +26,19 @@ CUSHION_SIZE = 40
 BALL_RADIUS = 10
 POCKET_RADIUS = 20
 
+PHYSICS_STEPS = 10  # batas atas substep per frame
+ADAPTIVE_SUBSTEPS = True
+SUBSTEP_CFL = 0.5  # perpindahan maksimum per substep, dalam kelipatan BALL_RADIUS
+CONTACT_SOLVER = "batched"  # "batched" (serentak) atau "pairwise" (per pasangan)
+CONTACT_ITERATIONS = 4
+BALL_FRICTION = 0.99
+STOP_SPEED = 0.05
+CUSHION_BOUNCE = 0.9
+MAX_SHOT_POWER = 25  # power maksimum stik (pemain dan komputer)
+PHYSICS_BACKEND = "python"  # "python" atau "numpy"
+PHYSICS_MODE = "substep"  # "substep" atau "event" (continuous collision)
+BROADPHASE_MIN_BALLS = 32  # di atas jumlah ini tumbukan memakai broadphase, bukan all-pairs
+
 TABLE_COLOR = (34, 139, 34)
 BORDER_COLOR = (80, 40, 0)
 POCKET_COLOR = (10, 10, 10)
@@ -35,6 +61,20 @@ TEXT_COLOR = (240, 240, 240)
 BUTTON_HOVER = (50, 50, 60)
 HIGHLIGHT_COLOR = (255, 255, 255, 100)
 
+AIM_ANGLE_STEPS = 3600  # resolusi kuantisasi sudut bidik untuk cache prediksi (0.1 derajat)
+CUE_ROTATION_STEPS = 720  # resolusi sprite stik yang sudah diputar (0.5 derajat)
+CUE_SPRITE_CACHE_SIZE = 128  # maksimum sprite stik di memori (~120 KB per sprite)
+CUE_EXACT_ROTATION = False  # True = rotasi tepat setiap frame tanpa cache
+TEXT_CACHE_SIZE = 256  # jumlah surface teks yang disimpan (LRU)
+DIRTY_RECT_RENDERING = True  # False = gambar ulang layar penuh + flip setiap frame
+
+AI_TIME_BUDGET = 1.5  # detik berpikir per giliran komputer
+AI_WORKERS = 0  # 0 = jumlah core CPU dikurangi satu (untuk thread UI)
+AI_BATCH_SIZE = 32
+AI_PHYSICS_MODE = "event"
+AI_MAX_EVENTS = 2000  # batas event per kandidat (mode event); lebih dari ini = tembakan tidak valid
+AI_MAX_FRAMES = 3000  # batas frame per kandidat (mode substep)
+
 STATE_MENU = "menu"
 STATE_INPUT_NAMES = "input_names"
 STATE_PLAYING = "playing"
@@ -45,4 +85,17 @@ STATE_LEADERBOARD = "leaderboard"
 STATE_PAUSED = "paused"
 STATE_TEAM = "team"
 
+LEADERBOARD_BACKEND = "sqlite"  # "sqlite" atau "json"
+LEADERBOARD_DB = "leaderboard.db"
+LEADERBOARD_JSON = "leaderboard.json"  # format lama; diimpor sekali ke SQLite
+LEADERBOARD_WRITE_DELAY = 0.5  # detik menunggu update lain sebelum batch ditulis
+LEADERBOARD_PAGE_SIZE = 7  # baris per halaman layar leaderboard
+
+PROFILER_OVERLAY = False  # overlay profiler frame aktif sejak awal (toggle: F3)
+PROFILER_HISTORY = 240  # jumlah frame terakhir untuk grafik & persentil
+PROFILER_REFRESH = 30  # frame antar pembaruan teks statistik overlay
+PROFILER_CSV_DIR = "profiles"  # folder CSV timing per frame (toggle: F4)
+
+STARTUP_REPORT = False  # cetak durasi fase startup ke konsol (selalu aktif di DEBUG_MODE)
+
 DEBUG_MODE = False
\ No newline at end of file
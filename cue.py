@@ -1,14 +1,20 @@
 import pygame # type: ignore
 import math
+from collections import OrderedDict
 from config import *
 from physics import PhysicsEngine
 
 class Cue:
-    def __init__(self, target_ball):
+    # Sprite stik yang sudah diputar, dipakai bersama semua instance (gambar stik selalu sama).
+    # LRU: sudut yang paling lama tidak dipakai dibuang saat melebihi CUE_SPRITE_CACHE_SIZE.
+    _sprite_cache = OrderedDict()
+
+    def __init__(self, target_ball, simulation=None):
         self.target_ball = target_ball
+        self.simulation = simulation
         self.angle = 0
         self.power = 0
-        self.max_power = 25
+        self.max_power = MAX_SHOT_POWER
         self.state = 0 
         
         self.sensitivity = 0.5 
@@ -19,6 +25,11 @@ class Cue:
         pygame.draw.rect(self.image, (139, 69, 19), (0, 0, self.width, self.height), border_radius=4)
         pygame.draw.rect(self.image, (240, 240, 240), (0, 0, 10, self.height), border_radius=4)
         
+        self._aim_key = None
+        self._aim_cache = None
+        self.rotation_steps = CUE_ROTATION_STEPS
+        self.exact_rotation = CUE_EXACT_ROTATION
+        
     def update(self, mouse_pos):
         if self.state == 0:
             dx = self.target_ball.pos.x - mouse_pos[0]
@@ -49,9 +60,31 @@ class Cue:
 
     def shoot(self):
         force = self.power
-        self.target_ball.hit(force, self.angle)
+        if self.simulation:
+            self.simulation.strike(self.target_ball, force, self.angle)
+        else:
+            self.target_ball.hit(force, self.angle)
         self.power = 0
 
+    def _rotated_stick(self):
+        """Sprite stik untuk sudut saat ini, diambil dari cache sudut terkuantisasi."""
+        angle_degrees = math.degrees(-self.angle)
+        if self.exact_rotation:
+            return pygame.transform.rotate(self.image, angle_degrees)
+
+        steps = self.rotation_steps
+        key = (steps, round(angle_degrees * steps / 360) % steps)
+        cache = Cue._sprite_cache
+        sprite = cache.get(key)
+        if sprite is None:
+            sprite = pygame.transform.rotate(self.image, key[1] * 360 / steps)
+            cache[key] = sprite
+            if len(cache) > CUE_SPRITE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return sprite
+
     def _ray_cast_wall(self, start_pos, direction, table_rect):
         """Menghitung titik temu ray dengan dinding meja"""
         if direction.length() == 0: return start_pos
@@ -75,42 +108,66 @@ class Cue:
         if t_min == float('inf'): return start_pos
         return start_pos + dir_norm * t_min
 
-    def draw(self, surface, all_balls, table_rect):
-        if self.target_ball.velocity.length() > 0 or self.target_ball.potted:
-            return
+    def predict(self, all_balls, table_rect, layout_version=None):
+        """
+        Menghitung prediksi lintasan bidikan: (start, end, ghost_ball, obj_line, cue_line).
+        Hasil di-cache dengan kunci (sudut terkuantisasi, versi susunan bola) sehingga selama
+        mouse dan bola tidak bergerak, ray cast tidak dijalankan ulang.
+        """
+        step = AIM_ANGLE_STEPS
+        angle_key = round(self.angle * step / (2 * math.pi)) % step
+        key = (angle_key, layout_version)
+        if layout_version is not None and key == self._aim_key:
+            return self._aim_cache
 
-        aim_vec = pygame.math.Vector2(math.cos(self.angle), math.sin(self.angle))
+        angle = angle_key * 2 * math.pi / step
+        aim_vec = pygame.math.Vector2(math.cos(angle), math.sin(angle))
         candidates = [b for b in all_balls if b != self.target_ball]
         hit_ball, hit_pos = PhysicsEngine.ray_cast_ball(self.target_ball.pos, aim_vec, candidates)
-        start_pos = self.target_ball.pos
+        start_pos = tuple(self.target_ball.pos)
+        obj_line = cue_line = ghost = None
         
         if hit_ball and hit_pos:
-            end_pos = hit_pos
-            pygame.draw.circle(surface, (255, 255, 255), (int(hit_pos.x), int(hit_pos.y)), BALL_RADIUS, 1)
+            end_pos = tuple(hit_pos)
+            ghost = (int(hit_pos.x), int(hit_pos.y))
             
             impact_vec = (hit_ball.pos - hit_pos).normalize()
-            
             obj_pred_end = self._ray_cast_wall(hit_ball.pos, impact_vec, table_rect)
-            
-            pygame.draw.line(surface, BLACK, hit_ball.pos, obj_pred_end, 3)
-            pygame.draw.circle(surface, BLACK, (int(obj_pred_end.x), int(obj_pred_end.y)), 3) # Titik ujung
+            obj_line = (tuple(hit_ball.pos), tuple(obj_pred_end))
             
             tangent_vec = pygame.math.Vector2(-impact_vec.y, impact_vec.x)
             if aim_vec.dot(tangent_vec) < 0: tangent_vec = -tangent_vec
             
             cue_pred_end = self._ray_cast_wall(hit_pos + tangent_vec, tangent_vec, table_rect)
+            cue_line = (end_pos, tuple(cue_pred_end))
+        else:
+            end_pos = tuple(self._ray_cast_wall(self.target_ball.pos, aim_vec, table_rect))
+
+        self._aim_key = key
+        self._aim_cache = (start_pos, end_pos, ghost, obj_line, cue_line)
+        return self._aim_cache
+
+    def draw(self, surface, all_balls, table_rect, layout_version=None):
+        """Menggambar garis bidik dan stik. Mengembalikan Rect area yang tergambar (None jika tersembunyi)."""
+        if self.target_ball.velocity.length() > 0 or self.target_ball.potted:
+            return None
+
+        start_pos, end_pos, ghost, obj_line, cue_line = self.predict(all_balls, table_rect, layout_version)
+        drawn = []
+        
+        if ghost:
+            drawn.append(pygame.draw.circle(surface, (255, 255, 255), ghost, BALL_RADIUS, 1))
             
-            pygame.draw.line(surface, WHITE, hit_pos, cue_pred_end, 2)
-            pygame.draw.circle(surface, WHITE, (int(cue_pred_end.x), int(cue_pred_end.y)), 3) # Titik ujung
+            drawn.append(pygame.draw.line(surface, BLACK, obj_line[0], obj_line[1], 3))
+            drawn.append(pygame.draw.circle(surface, BLACK, (int(obj_line[1][0]), int(obj_line[1][1])), 3)) # Titik ujung
             
-        else:
-            end_pos = self._ray_cast_wall(start_pos, aim_vec, table_rect)
+            drawn.append(pygame.draw.line(surface, WHITE, cue_line[0], cue_line[1], 2))
+            drawn.append(pygame.draw.circle(surface, WHITE, (int(cue_line[1][0]), int(cue_line[1][1])), 3)) # Titik ujung
             
-        pygame.draw.line(surface, BLACK, start_pos, end_pos, 4)
+        drawn.append(pygame.draw.line(surface, BLACK, start_pos, end_pos, 4))
         pygame.draw.line(surface, WHITE, start_pos, end_pos, 2)
 
-        angle_degrees = math.degrees(-self.angle)
-        rotated_stick = pygame.transform.rotate(self.image, angle_degrees)
+        rotated_stick = self._rotated_stick()
         pull_back = 20 + (self.power * 5)
         
         offset_x = math.cos(self.angle) * (self.width/2 + pull_back)
@@ -119,4 +176,5 @@ class Cue:
         center_y = self.target_ball.pos.y - offset_y
         
         rect = rotated_stick.get_rect(center=(center_x, center_y))
-        surface.blit(rotated_stick, rect)
\ No newline at end of file
+        surface.blit(rotated_stick, rect)
+        return rect.unionall(drawn)
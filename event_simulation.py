@@ -0,0 +1,232 @@
+import math
+from config import *
+from physics import PhysicsEngine
+from simulation import Simulation
+
+EVENT_STOP = "stop"
+EVENT_CUSHION = "cushion"
+EVENT_POCKET = "pocket"
+EVENT_BALL = "ball"
+
+
+class EventSimulation(Simulation):
+    """
+    Simulasi berbasis event (continuous collision) dengan time-of-impact analitik.
+
+    Gesekan dimodelkan kontinu: v(t) = v0 * f^t. Karena semua bola memakai koefisien
+    gesekan yang sama (BALL_FRICTION), perpindahan setiap bola yang bergerak adalah
+    v0 * s dengan s(t) = (1 - f^t) / k dan k = -ln f. Semua gerakan menjadi linear
+    terhadap s, sehingga waktu event berikutnya (bola-bola, cushion, lubang, bola berhenti)
+    cukup dicari dengan persamaan kuadrat lalu simulasi langsung melompat ke event tersebut.
+    Tidak ada substep dan tidak ada tunneling pada kecepatan berapa pun.
+    """
+
+    # Pengaman untuk konfigurasi kontak degeneratif (banyak event di s = 0)
+    MAX_EVENTS_PER_STEP = 2000
+    # Pasangan bola yang bersentuhan dengan kecepatan mendekat di bawah ini dianggap tidak bertumbukan
+    MIN_CLOSING_SPEED = 1e-6
+    # Setelah sekian event berturut-turut di s = 0, kontak bola-bola yang sudah bersentuhan diabaikan
+    MAX_ZERO_EVENTS = 64
+
+    def __init__(self, balls, bounds=None, pockets=None, steps=PHYSICS_STEPS):
+        super().__init__(balls, bounds, pockets, steps)
+        self.decay = -math.log(BALL_FRICTION)
+        self.time = 0.0
+        self.event_count = 0
+        self.zero_events = 0  # event berturut-turut dengan s = 0
+
+    def step(self):
+        """Memajukan simulasi tepat satu frame (t = 1) dengan melompat dari event ke event."""
+        if self.is_moving(): self.version += 1
+        self.advance(1.0)
+        self.frame += 1
+        return self._moving_count()
+
+    def advance(self, duration):
+        """Memajukan simulasi selama `duration` frame."""
+        remaining = duration
+        for _ in range(self.MAX_EVENTS_PER_STEP):
+            if remaining <= 0: break
+            event = self._next_event()
+            if event is None:
+                break
+            event_time = self._time_for(event[0])
+            if event_time > remaining:
+                self._drift(self._distance_for(remaining))
+                remaining = 0
+                break
+            self._drift(event[0])
+            remaining -= event_time
+            self._handle(event)
+        self.time += duration
+
+    def run_until_rest(self, max_frames=None, max_events=1000000):
+        """
+        Melompati event sampai semua bola diam. Mengembalikan jumlah event yang diproses.
+        max_frames sama dengan di Simulation (batas waktu simulasi dalam frame); max_events
+        membatasi jumlah event.
+        """
+        processed = 0
+        self.version += 1
+        end_time = None if max_frames is None else self.time + max_frames
+        while processed < max_events:
+            event = self._next_event()
+            if event is None:
+                break
+            event_time = self._time_for(event[0])
+            if end_time is not None and self.time + event_time > end_time:
+                # Berhenti tepat di batas waktu, seperti advance()
+                self._drift(self._distance_for(end_time - self.time))
+                self.time = end_time
+                break
+            self.time += event_time
+            self._drift(event[0])
+            self._handle(event)
+            processed += 1
+        return processed
+
+    def _distance_for(self, duration):
+        """Parameter s yang ditempuh selama `duration` frame."""
+        return -math.expm1(-self.decay * duration) / self.decay
+
+    def _time_for(self, s):
+        """Kebalikan dari _distance_for."""
+        return -math.log1p(-self.decay * s) / self.decay
+
+    def _drift(self, s):
+        """Menggeser semua bola yang bergerak sejauh v * s lalu meluruhkan kecepatannya."""
+        if s <= 0: return
+        scale = 1.0 - self.decay * s
+        for ball in self.balls:
+            v = ball.velocity
+            if ball.potted or not (v.x or v.y): continue
+            ball.pos.x += v.x * s
+            ball.pos.y += v.y * s
+            v.x *= scale
+            v.y *= scale
+
+    def _next_event(self):
+        """Mencari event paling awal: (s, jenis, bola, data) atau None jika semua diam."""
+        event = self._find_event(allow_contact=self.zero_events < self.MAX_ZERO_EVENTS)
+        if event is not None:
+            self.zero_events = self.zero_events + 1 if event[0] <= 0 else 0
+        return event
+
+    def _find_event(self, allow_contact=True):
+        """
+        allow_contact=False mengabaikan pasangan yang sudah bersentuhan (entry di s = 0), agar
+        rangkaian event tanpa jarak pasti berakhir: event lain di s = 0 (berhenti, cushion,
+        lubang) masing-masing hanya terjadi sekali.
+        """
+        balls = self.balls
+        best = None
+        left, top, right, bottom = self.bounds
+
+        moving = []
+        for index, ball in enumerate(balls):
+            if ball.potted: continue
+            vx, vy = ball.velocity.x, ball.velocity.y
+            if not (vx or vy): continue
+            moving.append(index)
+
+            speed = math.hypot(vx, vy)
+            s = max(0.0, (1.0 - STOP_SPEED / speed) / self.decay)
+            if best is None or s < best[0]:
+                best = (s, EVENT_STOP, index, None)
+
+            x, y, r = ball.pos.x, ball.pos.y, ball.radius
+            if vx < 0: s = (left + r - x) / vx
+            elif vx > 0: s = (right - r - x) / vx
+            else: s = math.inf
+            if s < best[0]:
+                best = (max(s, 0.0), EVENT_CUSHION, index, 'x')
+            if vy < 0: s = (top + r - y) / vy
+            elif vy > 0: s = (bottom - r - y) / vy
+            else: s = math.inf
+            if s < best[0]:
+                best = (max(s, 0.0), EVENT_CUSHION, index, 'y')
+
+            for pocket in self.pockets:
+                s = self._entry_distance(x - pocket[0], y - pocket[1], vx, vy, POCKET_RADIUS)
+                if s is not None and s < best[0]:
+                    best = (s, EVENT_POCKET, index, None)
+
+        if best is None:
+            return None
+
+        moving_set = set(moving)
+        for i in moving:
+            b1 = balls[i]
+            for j in range(len(balls)):
+                if j == i or (j < i and j in moving_set): continue
+                b2 = balls[j]
+                if b2.potted: continue
+                s = self._entry_distance(
+                    b1.pos.x - b2.pos.x, b1.pos.y - b2.pos.y,
+                    b1.velocity.x - b2.velocity.x, b1.velocity.y - b2.velocity.y,
+                    b1.radius + b2.radius, self.MIN_CLOSING_SPEED)
+                if s == 0.0 and not allow_contact: continue
+                if s is not None and s < best[0]:
+                    best = (s, EVENT_BALL, i, j)
+        return best
+
+    @staticmethod
+    def _entry_distance(dx, dy, wx, wy, reach, min_closing=0.0):
+        """
+        s terkecil saat |d + w s| turun ke `reach` (hanya jika saling mendekat).
+        Jika sudah di dalam `reach`, hanya dihitung bila kecepatan mendekat sepanjang normal
+        melebihi `min_closing`; kontak yang nyaris diam tidak memicu event berulang di s = 0.
+        """
+        b = dx * wx + dy * wy
+        if b >= 0: return None
+        c = dx * dx + dy * dy - reach * reach
+        if c <= 0:
+            if -b <= min_closing * math.sqrt(dx * dx + dy * dy): return None
+            return 0.0
+        a = wx * wx + wy * wy
+        disc = b * b - a * c
+        if disc < 0: return None
+        return (-b - math.sqrt(disc)) / a
+
+    def _handle(self, event):
+        _, kind, index, data = event
+        ball = self.balls[index]
+        self.event_count += 1
+
+        if kind == EVENT_STOP:
+            ball.velocity.x = 0
+            ball.velocity.y = 0
+        elif kind == EVENT_CUSHION:
+            left, top, right, bottom = self.bounds
+            r = ball.radius
+            if data == 'x':
+                ball.pos.x = min(max(ball.pos.x, left + r), right - r)
+                ball.velocity.x *= -CUSHION_BOUNCE
+            else:
+                ball.pos.y = min(max(ball.pos.y, top + r), bottom - r)
+                ball.velocity.y *= -CUSHION_BOUNCE
+        elif kind == EVENT_POCKET:
+            ball.potted = True
+            ball.velocity.x = 0
+            ball.velocity.y = 0
+            if self.on_pot: self.on_pot(ball)
+        elif kind == EVENT_BALL:
+            other = self.balls[data]
+            dx = ball.pos.x - other.pos.x
+            dy = ball.pos.y - other.pos.y
+            distance = math.hypot(dx, dy) or 0.001
+            PhysicsEngine.exchange_normal_velocity(ball, other, dx / distance, dy / distance)
+            # Kecepatan di bawah STOP_SPEED langsung nol, bukan event STOP di s = 0
+            for b in (ball, other):
+                if b.velocity.x * b.velocity.x + b.velocity.y * b.velocity.y < STOP_SPEED * STOP_SPEED:
+                    b.velocity.x = 0
+                    b.velocity.y = 0
+            if self.on_collision:
+                impact = math.hypot(ball.velocity.x - other.velocity.x, ball.velocity.y - other.velocity.y)
+                self.on_collision(ball, other, impact)
+
+    def is_moving(self):
+        return self._moving_count() > 0
+
+    def _moving_count(self):
+        return sum(1 for b in self.balls if not b.potted and (b.velocity.x or b.velocity.y))
@@ -0,0 +1,64 @@
+import pygame # type: ignore
+from collections import OrderedDict
+from config import *
+
+_fonts = {}
+
+
+def get_font(family, size, bold=False):
+    """
+    Registry font bersama untuk seluruh proses. SysFont (yang memindai font sistem)
+    hanya dipanggil sekali per (family, size, bold); pemanggil berikutnya mendapat objek yang sama.
+    """
+    key = (family, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+    return font
+
+
+class TextCache:
+    """
+    Cache LRU untuk surface teks hasil font.render.
+    Key: (font, teks, warna, antialias). Teks UI yang sama (tombol, label HUD, baris panel)
+    cukup dirender sekali, frame berikutnya hanya blit. Surface hasil cache dipakai bersama,
+    jadi jangan dimodifikasi oleh pemanggil.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, tuple(color), antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Pengganti font.render(text, antialias, color) yang melewati cache bersama."""
+    return text_cache.render(font, text, antialias, color)
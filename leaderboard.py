@@ -1,11 +1,113 @@
 import json
 import os
+import threading
+import time
 from datetime import datetime
+from config import *
 
-class Leaderboard:
-    def __init__(self, filename="leaderboard.json"):
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+
+def make_match(player1, player2, winner, shots=(0, 0), fouls=(0, 0), duration=0.0):
+    """Rekaman satu pertandingan selesai. shots/fouls berupa (pemain 1, pemain 2), durasi dalam detik."""
+    return {
+        "player1": player1.strip(), "player2": player2.strip(), "winner": winner.strip(),
+        "shots": tuple(shots), "fouls": tuple(fouls), "duration": float(duration),
+        "played_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def player_deltas(matches):
+    """
+    Menggabungkan satu batch pertandingan menjadi perubahan agregat per pemain.
+    Key: nama lowercase, nilai: [nama, games, wins, shots, fouls, last_played].
+    """
+    deltas = {}
+    for match in matches:
+        winner = match["winner"].lower()
+        for side, name in enumerate((match["player1"], match["player2"])):
+            if not name: continue
+            key = name.lower()
+            delta = deltas.setdefault(key, [name, 0, 0, 0, 0, match["played_at"]])
+            delta[3] += match["shots"][side]
+            delta[4] += match["fouls"][side]
+            delta[5] = match["played_at"]
+            # Nama yang sama di kedua sisi tetap dihitung satu pertandingan
+            if side == 1 and key == match["player1"].lower(): continue
+            delta[1] += 1
+            if key == winner: delta[2] += 1
+    return deltas
+
+
+def win_rate(wins, games):
+    return wins / games if games else 0.0
+
+
+class WriteBehindQueue:
+    """
+    Antrian write-behind untuk hasil pertandingan. add() tidak pernah menunggu I/O; thread latar
+    menulis semua rekaman yang terkumpul dalam satu batch setelah LEADERBOARD_WRITE_DELAY.
+    close() menulis sisa antrian dan menunggu thread selesai.
+    """
+
+    def __init__(self, write_batch, delay=LEADERBOARD_WRITE_DELAY):
+        self.write_batch = write_batch
+        self.delay = delay
+        self.pending = []
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+
+    def add(self, record):
+        with self.cond:
+            self.pending.append(record)
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closed:
+                    self.cond.wait()
+                # Beri waktu update lain bergabung ke batch yang sama; add() yang membangunkan
+                # thread ini tidak memperpendek jeda, hanya close() yang bisa
+                deadline = time.monotonic() + self.delay
+                while not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    self.cond.wait(remaining)
+                batch, self.pending = self.pending, []
+                closed = self.closed
+            if batch:
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    print(f"Gagal menyimpan leaderboard: {e}")
+            if closed and not batch:
+                return
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
+
+
+class JsonLeaderboard:
+    """
+    Leaderboard lama berbasis satu file JSON; dipakai jika SQLite tidak tersedia.
+    Hanya menyimpan agregat per pemain (tanpa riwayat pertandingan).
+    Penulisan lewat WriteBehindQueue, dan file diganti secara atomik (file sementara + rename).
+    """
+
+    def __init__(self, filename=LEADERBOARD_JSON, write_behind=True):
         self.filename = filename
         self.data = self._load_data()
+        self.version = 0  # naik setiap data berubah (dipakai cache tampilan)
+        self.writer = WriteBehindQueue(self._write_batch) if write_behind else None
 
     def _load_data(self):
         """Memuat data dari file JSON, jika tidak ada buat baru."""
@@ -17,42 +119,275 @@ class Leaderboard:
         except (json.JSONDecodeError, IOError):
             return []
 
-    def save_data(self):
-        """Menyimpan data ke file JSON."""
+    def save_data(self, data=None):
+        """Menyimpan data ke file JSON lewat file sementara + rename agar file tidak pernah setengah jadi."""
+        tmp = self.filename + ".tmp"
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.data, f, indent=4)
+            with open(tmp, 'w') as f:
+                json.dump(self.data if data is None else data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filename)
         except IOError as e:
             print(f"Gagal menyimpan leaderboard: {e}")
 
-    def add_win(self, player_name):
-        """
-        Menambahkan kemenangan ke pemain. 
-        Jika pemain sudah ada, update 'wins'. Jika belum, buat baru.
-        """
-        player_name = player_name.strip()
-        if not player_name: return
-
-        found = False
-        for entry in self.data:
-            if entry['name'].lower() == player_name.lower():
-                entry['wins'] += 1
-                entry['last_played'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-                found = True
-                break
-        
-        if not found:
-            new_entry = {
-                "name": player_name,
-                "wins": 1,
-                "last_played": datetime.now().strftime("%Y-%m-%d %H:%M")
-            }
-            self.data.append(new_entry)
-        
+    def record_match(self, match):
+        """Mencatat pertandingan selesai (lihat make_match)."""
+        if self.writer: self.writer.add(match)
+        else: self._write_batch([match])
+
+    def _write_batch(self, matches):
+        # Salinan baru lalu tukar referensi, agar thread utama selalu melihat list utuh
+        data = [dict(entry) for entry in self.data]
+        index = {entry['name'].lower(): entry for entry in data}
+        for key, (name, games, wins, shots, fouls, now) in player_deltas(matches).items():
+            entry = index.get(key)
+            if entry is None:
+                entry = index[key] = {"name": name, "wins": 0}
+                data.append(entry)
+            # Entri lama hanya punya 'wins'; anggap setiap kemenangan lama satu pertandingan
+            entry['games'] = entry.get('games', entry['wins']) + games
+            entry['wins'] += wins
+            entry['shots'] = entry.get('shots', 0) + shots
+            entry['fouls'] = entry.get('fouls', 0) + fouls
+            entry['last_played'] = now
+
         # Urutkan berdasarkan kemenangan terbanyak
-        self.data.sort(key=lambda x: x['wins'], reverse=True)
-        self.save_data()
+        data.sort(key=lambda x: x['wins'], reverse=True)
+        self.data = data
+        self.version += 1
+        self.save_data(data)
 
     def get_top_players(self, limit=5):
         """Mengambil top players."""
-        return self.data[:limit]
\ No newline at end of file
+        return self.get_page(limit)[0]
+
+    def get_page(self, limit, cursor=None):
+        """Satu halaman ranking; cursor = offset baris. Mengembalikan (baris, cursor berikutnya atau None)."""
+        data = self.data
+        start = cursor or 0
+        rows = [self._row(start + i + 1, entry) for i, entry in enumerate(data[start:start + limit])]
+        return rows, (start + limit if start + limit < len(data) else None)
+
+    def rank_of(self, player_name):
+        """Ranking dan statistik satu pemain, atau None jika belum pernah bermain."""
+        key = player_name.strip().lower()
+        for i, entry in enumerate(self.data):
+            if entry['name'].lower() == key: return self._row(i + 1, entry)
+        return None
+
+    def recent_matches(self, player_name, limit=10):
+        """Backend JSON tidak menyimpan riwayat pertandingan."""
+        return []
+
+    @staticmethod
+    def _row(rank, entry):
+        games = entry.get('games', entry['wins'])
+        return {"rank": rank, "name": entry['name'], "wins": entry['wins'], "games": games,
+                "win_rate": win_rate(entry['wins'], games), "shots": entry.get('shots', 0),
+                "fouls": entry.get('fouls', 0), "last_played": entry.get('last_played')}
+
+    def close(self):
+        if self.writer: self.writer.close()
+
+
+class Leaderboard:
+    """
+    Leaderboard dan riwayat pertandingan berbasis SQLite.
+
+    Tabel players menyimpan agregat per pemain (games, wins, shots, fouls) yang diperbarui
+    secara inkremental setiap pertandingan selesai, dengan index unik pada nama yang di-lowercase
+    (pencarian case-insensitive) dan index (wins DESC, id) untuk ranking. Tabel matches menyimpan
+    setiap pertandingan dan ter-index per pemain. Halaman ranking memakai keyset pagination
+    (lanjut dari baris terakhir halaman sebelumnya, tanpa OFFSET), jadi biaya satu halaman
+    tidak tumbuh dengan jumlah pemain. Isi leaderboard.json lama diimpor sekali saat database
+    pertama kali dibuka.
+
+    Penulisan tidak pernah di thread game: record_match masuk WriteBehindQueue dan thread latar
+    menulis setiap batch dalam satu transaksi lewat koneksinya sendiri. Mode WAL membuat
+    pembacaan di thread utama tidak terblokir oleh transaksi tersebut.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_key TEXT NOT NULL,
+            wins INTEGER NOT NULL DEFAULT 0,
+            last_played TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_players_name ON players(name_key);
+        CREATE INDEX IF NOT EXISTS idx_players_wins ON players(wins DESC, id);
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY,
+            player1_id INTEGER NOT NULL REFERENCES players(id),
+            player2_id INTEGER NOT NULL REFERENCES players(id),
+            winner_id INTEGER REFERENCES players(id),
+            p1_shots INTEGER NOT NULL DEFAULT 0,
+            p2_shots INTEGER NOT NULL DEFAULT 0,
+            p1_fouls INTEGER NOT NULL DEFAULT 0,
+            p2_fouls INTEGER NOT NULL DEFAULT 0,
+            duration REAL NOT NULL DEFAULT 0,
+            played_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_matches_player1 ON matches(player1_id, id);
+        CREATE INDEX IF NOT EXISTS idx_matches_player2 ON matches(player2_id, id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    # Kolom agregat yang ditambahkan ke tabel players (juga pada database versi lama)
+    AGGREGATE_COLUMNS = ("games", "shots", "fouls")
+    PLAYER_COLUMNS = "id, name, wins, games, shots, fouls, last_played"
+
+    def __init__(self, filename=LEADERBOARD_DB, json_filename=LEADERBOARD_JSON):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self._add_aggregate_columns()
+        self.version = 0
+        self._migrate_json(json_filename)
+        # Koneksi khusus thread penulis (hanya dipakai dari thread tersebut)
+        self.writer_conn = sqlite3.connect(filename, check_same_thread=False)
+        self.writer = WriteBehindQueue(self._write_batch)
+
+    def _add_aggregate_columns(self):
+        """Menambah kolom agregat yang belum ada. Untuk data lama games diisi = wins (kekalahan tidak tercatat)."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(players)")}
+        with self.conn:
+            for column in self.AGGREGATE_COLUMNS:
+                if column in existing: continue
+                self.conn.execute(f"ALTER TABLE players ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+                if column == "games":
+                    self.conn.execute("UPDATE players SET games = wins")
+
+    def _migrate_json(self, json_filename):
+        """Mengimpor leaderboard.json (urutan ranking dipertahankan lewat id). File JSON tidak dihapus."""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        rows = JsonLeaderboard(json_filename, write_behind=False).data if os.path.exists(json_filename) else []
+        with self.conn:
+            for entry in rows:
+                name = str(entry.get('name', '')).strip()
+                if not name: continue
+                wins = int(entry.get('wins', 0))
+                self.conn.execute(
+                    "INSERT INTO players (name, name_key, wins, games, last_played) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(name_key) DO UPDATE SET wins = wins + excluded.wins, games = games + excluded.games",
+                    (name, name.lower(), wins, int(entry.get('games', wins)), entry.get('last_played')))
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(len(rows)),))
+
+    def record_match(self, match):
+        """Mencatat pertandingan selesai (lihat make_match); ditulis oleh thread latar."""
+        self.writer.add(match)
+
+    def _write_batch(self, matches):
+        """
+        Dijalankan di thread penulis. Agregat digabung per pemain (satu upsert per pemain per batch),
+        lalu setiap pertandingan disisipkan ke tabel matches, semuanya dalam satu transaksi.
+        """
+        conn = self.writer_conn
+        with conn:
+            conn.executemany(
+                "INSERT INTO players (name, name_key, wins, games, shots, fouls, last_played) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name_key) DO UPDATE SET wins = wins + excluded.wins, games = games + excluded.games, "
+                "shots = shots + excluded.shots, fouls = fouls + excluded.fouls, last_played = excluded.last_played",
+                [(name, key, wins, games, shots, fouls, now)
+                 for key, (name, games, wins, shots, fouls, now) in player_deltas(matches).items()])
+
+            ids = {}
+            def player_id(name):
+                key = name.lower()
+                if key not in ids:
+                    row = conn.execute("SELECT id FROM players WHERE name_key = ?", (key,)).fetchone()
+                    ids[key] = row[0] if row else None
+                return ids[key]
+
+            conn.executemany(
+                "INSERT INTO matches (player1_id, player2_id, winner_id, p1_shots, p2_shots, "
+                "p1_fouls, p2_fouls, duration, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(player_id(m["player1"]), player_id(m["player2"]), player_id(m["winner"]),
+                  m["shots"][0], m["shots"][1], m["fouls"][0], m["fouls"][1], m["duration"], m["played_at"])
+                 for m in matches if m["player1"] and m["player2"]])
+        self.version += 1
+
+    def get_top_players(self, limit=5):
+        """Mengambil top players langsung dari index wins."""
+        return self.get_page(limit)[0]
+
+    def get_page(self, limit, cursor=None):
+        """
+        Satu halaman ranking berurutan (wins DESC, id). cursor berasal dari halaman sebelumnya
+        (None = halaman pertama). Mengembalikan (baris, cursor berikutnya atau None).
+        """
+        # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+        if cursor is None:
+            rank = 1
+            rows = self.conn.execute(
+                f"SELECT {self.PLAYER_COLUMNS} FROM players ORDER BY wins DESC, id LIMIT ?", (limit + 1,)).fetchall()
+        else:
+            rank, wins, last_id = cursor
+            # Sisa pemain dengan wins sama setelah id terakhir, lalu pemain dengan wins lebih kecil
+            rows = self.conn.execute(
+                f"SELECT {self.PLAYER_COLUMNS} FROM players WHERE wins = ? AND id > ? ORDER BY id LIMIT ?",
+                (wins, last_id, limit + 1)).fetchall()
+            if len(rows) <= limit:
+                rows += self.conn.execute(
+                    f"SELECT {self.PLAYER_COLUMNS} FROM players WHERE wins < ? ORDER BY wins DESC, id LIMIT ?",
+                    (wins, limit + 1 - len(rows))).fetchall()
+
+        page = [self._row(rank + i, row) for i, row in enumerate(rows[:limit])]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = (rank + limit, last[2], last[0])
+        return page, next_cursor
+
+    def rank_of(self, player_name):
+        """Ranking dan statistik satu pemain, atau None jika belum pernah bermain."""
+        row = self.conn.execute(
+            f"SELECT {self.PLAYER_COLUMNS} FROM players WHERE name_key = ?", (player_name.strip().lower(),)).fetchone()
+        if row is None: return None
+        ahead = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM players WHERE wins > ?) + "
+            "(SELECT COUNT(*) FROM players WHERE wins = ? AND id < ?)", (row[2], row[2], row[0])).fetchone()[0]
+        return self._row(ahead + 1, row)
+
+    def recent_matches(self, player_name, limit=10):
+        """Pertandingan terakhir seorang pemain, terbaru dulu."""
+        row = self.conn.execute("SELECT id FROM players WHERE name_key = ?", (player_name.strip().lower(),)).fetchone()
+        if row is None: return []
+        rows = self.conn.execute(
+            "SELECT p1.name, p2.name, w.name, m.p1_shots, m.p2_shots, m.p1_fouls, m.p2_fouls, m.duration, m.played_at "
+            "FROM matches m JOIN players p1 ON p1.id = m.player1_id JOIN players p2 ON p2.id = m.player2_id "
+            "LEFT JOIN players w ON w.id = m.winner_id "
+            "WHERE m.id IN (SELECT id FROM (SELECT id FROM matches WHERE player1_id = ? ORDER BY id DESC LIMIT ?) "
+            "UNION SELECT id FROM (SELECT id FROM matches WHERE player2_id = ? ORDER BY id DESC LIMIT ?)) "
+            "ORDER BY m.id DESC LIMIT ?",
+            (row[0], limit, row[0], limit, limit)).fetchall()
+        return [{"player1": p1, "player2": p2, "winner": w, "shots": (s1, s2), "fouls": (f1, f2),
+                 "duration": duration, "played_at": played_at}
+                for p1, p2, w, s1, s2, f1, f2, duration, played_at in rows]
+
+    @staticmethod
+    def _row(rank, row):
+        _, name, wins, games, shots, fouls, last_played = row
+        return {"rank": rank, "name": name, "wins": wins, "games": games, "win_rate": win_rate(wins, games),
+                "shots": shots, "fouls": fouls, "last_played": last_played}
+
+    def close(self):
+        """Menulis sisa antrian lalu menutup koneksi."""
+        self.writer.close()
+        self.writer_conn.close()
+        self.conn.close()
+
+
+def open_leaderboard():
+    """Leaderboard sesuai LEADERBOARD_BACKEND; kembali ke JSON jika SQLite tidak bisa dipakai."""
+    if LEADERBOARD_BACKEND == "sqlite" and sqlite3 is not None:
+        try:
+            return Leaderboard()
+        except sqlite3.Error as e:
+            print(f"Leaderboard SQLite tidak tersedia, memakai JSON: {e}")
+    return JsonLeaderboard()
@@ -1,40 +1,85 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
 import pygame # type: ignore
 import sys
-import array
+import multiprocessing
 from config import *
 from ball import CueBall, ObjectBall
 from table import Table
 from cue import Cue
-from physics import PhysicsEngine
-from leaderboard import Leaderboard
+from simulation import create_simulation, rack_layout
+from leaderboard import open_leaderboard, make_match
+from ai import ShotPlanner
+from sprites import BallSprites
+from fonts import get_font, render_text, text_cache
+from synth import WaveCache
+from profiler import FrameProfiler
 
 class SoundGenerator:
-    """Class untuk menghasilkan efek suara sintetis tanpa file eksternal"""
+    """
+    Class untuk menghasilkan efek suara sintetis tanpa file eksternal.
+    Mixer dan semua buffer suara baru dibuat saat suara pertama kali diputar, bukan saat startup.
+    Event suara dari fisika dikumpulkan lewat queue() lalu diputar sekali per frame oleh flush():
+    event sejenis digabung (volume mengikuti tumbukan terkuat), dibatasi SOUND_MIN_INTERVAL,
+    dan diputar bergiliran di channel yang dicadangkan khusus untuk efek suara.
+    """
+    # nama -> (waveform, frekuensi, durasi, amplitudo, envelope), lihat synth.synthesize
+    SOUNDS = {
+        'hit': ("square", 400, 0.1, 4000, "flat"),
+        'pocket': ("square", 800, 0.2, 4000, "flat"),
+    }
+
     def __init__(self):
         self.enabled = True
+        self.has_mixer = None  # None = mixer belum dicoba
+        self.sounds = {}
+        self.waves = WaveCache()
+        self.channels = []
+        self.next_channel = 0
+        self.pending = {}
+        self.last_played = {}
+
+    def _init_mixer(self):
         try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=1, buffer=512)
-            self.sounds = {}
-            self.sounds['hit'] = self._generate_beep(400, 0.1)    
-            self.sounds['pocket'] = self._generate_beep(800, 0.2) 
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1, buffer=512)
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), SOUND_CHANNELS))
+            pygame.mixer.set_reserved(SOUND_CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(SOUND_CHANNELS)]
+            # Dibuat di dalam guard yang sama: backend yang gagal membuat Sound berarti tanpa suara
+            self.sounds = {name: self._create_sound(name) for name in self.SOUNDS}
             self.has_mixer = True
         except Exception:
             self.has_mixer = False
 
-    def _generate_beep(self, frequency, duration):
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration)
-        buffer = array.array('h', [0] * n_samples)
-        amplitude = 4000 
-        period = sample_rate / frequency
-        for i in range(n_samples):
-            if (i // (period / 2)) % 2 == 0: buffer[i] = amplitude
-            else: buffer[i] = -amplitude
-        return pygame.mixer.Sound(buffer)
-
-    def play(self, name):
-        if self.enabled and self.has_mixer and name in self.sounds:
-            self.sounds[name].play()
+    def _create_sound(self, name):
+        return pygame.mixer.Sound(buffer=self.waves.load(*self.SOUNDS[name]))
+
+    def queue(self, name, volume=1.0):
+        """Mencatat event suara untuk frame ini; event sejenis digabung ke volume terbesar."""
+        if not self.enabled or name not in self.SOUNDS: return
+        self.pending[name] = max(self.pending.get(name, 0.0), min(volume, 1.0))
+
+    def flush(self):
+        """Memutar event yang terkumpul, paling banyak satu panggilan per jenis suara."""
+        if not self.pending: return
+        now = time.perf_counter()
+        for name, volume in list(self.pending.items()):
+            # Terlalu rapat dengan suara sejenis sebelumnya: tahan ke frame berikutnya
+            if now - self.last_played.get(name, -1.0) < SOUND_MIN_INTERVAL: continue
+            del self.pending[name]
+            self.last_played[name] = now
+            self.play(name, volume)
+
+    def play(self, name, volume=1.0):
+        if not self.enabled or name not in self.SOUNDS: return
+        if self.has_mixer is None: self._init_mixer()
+        if not self.has_mixer: return
+        sound = self.sounds[name]
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
+        channel.play(sound)
+        channel.set_volume(max(volume, SOUND_MIN_VOLUME))
 
 class Button:
     def __init__(self, x, y, w, h, text, color=ACCENT_COLOR):
@@ -43,17 +88,29 @@ class Button:
         self.color = color
         self.hover_color = BUTTON_HOVER
         self.is_hovered = False
-        self.font = pygame.font.SysFont('Arial', 20, bold=True)
+        self.font = get_font('Arial', 20, bold=True)
+        self.surfaces = {}
 
     def draw(self, surface):
+        # Tombol (bayangan, badan, border, teks) dirender sekali per (teks, warna, hover)
+        key = (self.text, self.color, self.is_hovered)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.surfaces[key] = self._render()
+        surface.blit(surf, self.rect.topleft)
+
+    def _render(self):
+        w, h = self.rect.size
+        surf = pygame.Surface((w + 2, h + 2), pygame.SRCALPHA)
         color = self.color if not self.is_hovered else self.hover_color
-        pygame.draw.rect(surface, (10, 10, 10), (self.rect.x + 2, self.rect.y + 2, self.rect.w, self.rect.h), border_radius=8)
-        pygame.draw.rect(surface, color, self.rect, border_radius=8)
-        pygame.draw.rect(surface, WHITE, self.rect, 2, border_radius=8)
+        pygame.draw.rect(surf, (10, 10, 10), (2, 2, w, h), border_radius=8)
+        pygame.draw.rect(surf, color, (0, 0, w, h), border_radius=8)
+        pygame.draw.rect(surf, WHITE, (0, 0, w, h), 2, border_radius=8)
         
-        text_surf = self.font.render(self.text, True, WHITE)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
+        text_surf = render_text(self.font, self.text, True, WHITE)
+        text_rect = text_surf.get_rect(center=(w // 2, h // 2))
+        surf.blit(text_surf, text_rect)
+        return surf
 
     def check_hover(self, mouse_pos):
         self.is_hovered = self.rect.collidepoint(mouse_pos)
@@ -73,7 +130,7 @@ class TextInput:
         self.active = False
         self.color_inactive = GREY
         self.color_active = ACCENT_COLOR
-        self.font = pygame.font.SysFont('Arial', 24)
+        self.font = get_font('Arial', 24)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -99,32 +156,43 @@ class TextInput:
         display_text = self.text if self.text else self.placeholder
         color_text = WHITE if self.text else GREY
         
-        txt_surface = self.font.render(display_text, True, color_text)
+        txt_surface = render_text(self.font, display_text, True, color_text)
         surface.blit(txt_surface, (self.rect.x + 10, self.rect.y + (self.rect.h - txt_surface.get_height()) // 2))
 
 class GameManager:
     def __init__(self):
-        pygame.init()
+        self.startup_marks = [("imports", time.perf_counter())]
+        self.first_frame_shown = False
+        # Hanya modul yang dibutuhkan frame pertama; mixer diinisialisasi saat suara pertama
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Billiard 8-Ball Master - Final Project")
         self.clock = pygame.time.Clock()
+        self.mark_startup("display")
         
-        self.font = pygame.font.SysFont('Arial', 18)
-        self.debug_font = pygame.font.SysFont('Consolas', 14)
-        self.title_font = pygame.font.SysFont('Arial', 48, bold=True)
-        self.header_font = pygame.font.SysFont('Arial', 28, bold=True)
-        self.ball_font = pygame.font.SysFont('Arial', 10, bold=True)
-        self.ui_ball_font = pygame.font.SysFont('Arial', 12, bold=True)
+        self.font = get_font('Arial', 18)
+        self.debug_font = get_font('Consolas', 14)
+        self.title_font = get_font('Arial', 48, bold=True)
+        self.header_font = get_font('Arial', 28, bold=True)
+        self.ball_font = get_font('Arial', 10, bold=True)
+        self.ui_ball_font = get_font('Arial', 12, bold=True)
+        self.mark_startup("fonts")
         
         self.state = STATE_MENU
         self.sound_manager = SoundGenerator()
-        self.leaderboard = Leaderboard()
+        self.leaderboard = open_leaderboard()
+        self.leaderboard_cursors = [None]  # cursor awal setiap halaman yang sudah dikunjungi
+        self.leaderboard_page = 0
+        self.leaderboard_version = self.leaderboard.version
 
         self.ball_colors = {
             1: YELLOW, 2: BLUE, 3: RED, 4: PURPLE, 5: ORANGE, 6: GREEN, 7: MAROON,
             9: YELLOW, 10: BLUE, 11: RED, 12: PURPLE, 13: ORANGE, 14: GREEN, 15: MAROON,
             8: BLACK
         }
+        self.sprites = BallSprites(self.ball_colors, self.ball_font, self.ui_ball_font)
+        self.mark_startup("sprites")
 
         self.sens_values = [0.5, 1.0, 1.5]
         self.sens_names = ["LOW", "NORMAL", "HIGH"]
@@ -134,9 +202,35 @@ class GameManager:
         self.p2_name = "Player 2"
         self.winner_name = ""
 
+        self.vs_cpu = False
+        self.ai = ShotPlanner()
+
+        self.screen_cache = {}
+        self.pause_snapshot = None
+
+        self.idle = False
+        self.turbo = TURBO_MODE
+        self.cpu_usage = 0.0
+        self.cpu_sample = (time.perf_counter(), time.process_time())
+        self.profiler = FrameProfiler()
+
         self.init_ui()
         self.init_input_ui()
+        self.mark_startup("ui")
         self.reset_game_objects()
+        self.mark_startup("table")
+
+    def mark_startup(self, phase):
+        self.startup_marks.append((phase, time.perf_counter()))
+
+    def report_startup(self):
+        """Mencetak durasi setiap fase startup sampai frame pertama tampil di layar."""
+        parts = []
+        prev = STARTUP_TIME
+        for phase, t in self.startup_marks:
+            parts.append(f"{phase} {(t - prev) * 1000:.0f} ms")
+            prev = t
+        print(f"Startup: {' | '.join(parts)} | total {(prev - STARTUP_TIME) * 1000:.0f} ms")
 
     def init_ui(self):
         cx = SCREEN_WIDTH // 2
@@ -151,11 +245,18 @@ class GameManager:
         self.btn_quit = Button(cx - 100, start_y + gap * 5, 200, 45, "QUIT")
         
         self.btn_back_panel = Button(cx - 100, 580, 200, 40, "BACK", GREY)
+        self.btn_prev_page = Button(cx - 180, 580, 60, 40, "<", GREY)
+        self.btn_next_page = Button(cx + 120, 580, 60, 40, ">", GREY)
         
         self.btn_toggle_sound = Button(cx - 100, 300, 200, 50, "SOUND: ON")
         self.btn_sensitivity = Button(cx - 100, 370, 200, 50, f"SENSITIVITY: {self.sens_names[0]}")
+        self.btn_opponent = Button(cx - 100, 440, 200, 50, "OPPONENT: HUMAN")
         
         self.btn_pause_game = Button(SCREEN_WIDTH - 120, 20, 100, 40, "MENU", GREY)
+        self.pause_rect = self.btn_pause_game.rect.inflate(2, 2).move(1, 1)  # termasuk bayangan
+        self.hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 80)
+        self.power_bar_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, 25, 200, 30)
+        self.debug_rect = pygame.Rect(0, SCREEN_HEIGHT - 95, 400, 95)
         
         self.btn_resume = Button(cx - 100, SCREEN_HEIGHT//2 - 60, 200, 50, "RESUME", ACCENT_COLOR)
         self.btn_restart = Button(cx - 100, SCREEN_HEIGHT//2 + 10, 200, 50, "RESTART MATCH", RED)
@@ -172,34 +273,31 @@ class GameManager:
 
     def reset_game_objects(self):
         self.table = Table()
+        self.build_background()
         self.cue_ball = CueBall(TABLE_X + 200, TABLE_Y + PLAY_HEIGHT // 2)
         self.balls = [self.cue_ball]
         
-        self.cue = Cue(self.cue_ball)
-        self.cue.sensitivity = self.sens_values[self.current_sens_idx]
-        
-        start_x = TABLE_X + 600
-        start_y = TABLE_Y + PLAY_HEIGHT // 2
-        
         colors = [YELLOW, BLUE, RED, PURPLE, ORANGE, GREEN, MAROON, BLACK, 
                   YELLOW, BLUE, RED, PURPLE, ORANGE, GREEN, MAROON]
-        numbers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]
         
-        ball_idx = 0
-        rows = 5
-        for col in range(rows):
-            for row in range(col + 1):
-                x = start_x + (col * (BALL_RADIUS * 2 + 1))
-                y = start_y - (col * BALL_RADIUS) + (row * (BALL_RADIUS * 2 + 1))
-                
-                num = numbers[ball_idx]
-                if num == 8: c = BLACK
-                elif num <= 7: c = colors[num-1]
-                else: c = colors[num-9]
-                
-                self.balls.append(ObjectBall(x, y, c, num))
-                ball_idx += 1
-                if ball_idx >= 15: break
+        for num, x, y in rack_layout(TABLE_X + 600, TABLE_Y + PLAY_HEIGHT // 2):
+            if num == 8: c = BLACK
+            elif num <= 7: c = colors[num-1]
+            else: c = colors[num-9]
+            self.balls.append(ObjectBall(x, y, c, num))
+        
+        self.sim = create_simulation(self.balls, self.table.bounds, self.table.pockets)
+        self.sim.on_pot = self.on_ball_potted
+        self.sim.on_collision = self.on_ball_collision
+        
+        self.prev_positions = [(b.pos.x, b.pos.y) for b in self.balls]
+        self.accumulator = 0.0
+        self.last_update = None
+        self.ticks_this_frame = 0
+        
+        self.cue = Cue(self.cue_ball, self.sim)
+        self.cue.sensitivity = self.sens_values[self.current_sens_idx]
+        self.ai.cancel()
         
         self.turn = 1
         self.player_assignments = {1: None, 2: None}
@@ -210,46 +308,70 @@ class GameManager:
         self.message_timer = 120
         self.winner_text = ""
         self.winner_name = ""
+        self.shots = {1: 0, 2: 0}
+        self.fouls = {1: 0, 2: 0}
+        self.match_start = time.perf_counter()
 
     def run(self):
         while True:
+            events = self.poll_events()
+            if not events and self.idle and not DEBUG_MODE:
+                continue  # Tidak ada yang berubah: lewati update dan render
+            self.profiler.begin_frame()
             mouse_pos = pygame.mouse.get_pos()
-            events = pygame.event.get()
             
             for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit_game()
+                if event.type == pygame.WINDOWEXPOSED:
+                    self.frame_valid = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                    self.frame_valid = False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    path = self.profiler.toggle_csv()
+                    if path: print(f"Profil frame: {path}")
+                    elif not self.profiler.warning: print("Profil frame: CSV ditutup")
                 
                 if self.state == STATE_MENU:
                     if self.btn_start.is_clicked(event): 
                         self.state = STATE_INPUT_NAMES
                         self.input_p1.text = ""
                         self.input_p2.text = ""
-                    if self.btn_leaderboard.is_clicked(event): self.state = STATE_LEADERBOARD
+                    if self.btn_leaderboard.is_clicked(event):
+                        self.state = STATE_LEADERBOARD
+                        self.reset_leaderboard_pages()
                     if self.btn_tutorial.is_clicked(event): self.state = STATE_TUTORIAL
                     if self.btn_team.is_clicked(event): self.state = STATE_TEAM
                     if self.btn_settings.is_clicked(event): self.state = STATE_SETTINGS
-                    if self.btn_quit.is_clicked(event): pygame.quit(); sys.exit()
+                    if self.btn_quit.is_clicked(event): self.quit_game()
 
                 elif self.state == STATE_INPUT_NAMES:
                     self.input_p1.handle_event(event)
                     self.input_p2.handle_event(event)
                     if self.btn_start_match.is_clicked(event):
                         self.p1_name = self.input_p1.text if self.input_p1.text.strip() else "Player 1"
-                        self.p2_name = self.input_p2.text if self.input_p2.text.strip() else "Player 2"
+                        default_p2 = "CPU" if self.vs_cpu else "Player 2"
+                        self.p2_name = self.input_p2.text if self.input_p2.text.strip() else default_p2
                         self.reset_game_objects()
                         self.state = STATE_PLAYING
                     if self.btn_back_panel.is_clicked(event): self.state = STATE_MENU
 
                 elif self.state == STATE_PLAYING:
-                    if self.btn_pause_game.is_clicked(event): self.state = STATE_PAUSED
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                        self.turbo = not self.turbo
+                        self.message = f"Turbo: {'ON' if self.turbo else 'OFF'}"
+                        self.message_timer = 60
+                    if self.btn_pause_game.is_clicked(event):
+                        self.state = STATE_PAUSED
+                        self.pause_snapshot = None
                     if not self.btn_pause_game.is_hovered:
                         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                            if not self.is_moving:
+                            if not self.is_moving and not self.is_cpu_turn():
                                 if self.cue.handle_click():
                                     self.is_moving = True
-                                    self.sound_manager.play('hit')
+                                    self.shots[self.turn] += 1
+                                    self.sound_manager.queue('hit', self.cue.power / self.cue.max_power)
                         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
                             self.cue.cancel_shot()
 
@@ -264,14 +386,24 @@ class GameManager:
                 elif self.state in [STATE_SETTINGS, STATE_TUTORIAL, STATE_TEAM, STATE_LEADERBOARD]:
                     if self.btn_back_panel.is_clicked(event): self.state = STATE_MENU
                     
+                    if self.state == STATE_LEADERBOARD:
+                        if self.leaderboard_page > 0 and self.btn_prev_page.is_clicked(event):
+                            self.leaderboard_page -= 1
+                        if self.has_next_page() and self.btn_next_page.is_clicked(event):
+                            self.leaderboard_page += 1
+
                     if self.state == STATE_SETTINGS:
                         if self.btn_toggle_sound.is_clicked(event):
                             self.sound_manager.enabled = not self.sound_manager.enabled
+                            self.sound_manager.pending.clear()
                             self.btn_toggle_sound.text = f"SOUND: {'ON' if self.sound_manager.enabled else 'OFF'}"
                         if self.btn_sensitivity.is_clicked(event):
                             self.current_sens_idx = (self.current_sens_idx + 1) % 3
                             self.btn_sensitivity.text = f"SENSITIVITY: {self.sens_names[self.current_sens_idx]}"
                             if self.cue: self.cue.sensitivity = self.sens_values[self.current_sens_idx]
+                        if self.btn_opponent.is_clicked(event):
+                            self.vs_cpu = not self.vs_cpu
+                            self.btn_opponent.text = f"OPPONENT: {'CPU' if self.vs_cpu else 'HUMAN'}"
 
                 elif self.state == STATE_PAUSED:
                     if self.btn_resume.is_clicked(event): self.state = STATE_PLAYING
@@ -282,7 +414,10 @@ class GameManager:
                         self.reset_game_objects()
                         self.state = STATE_MENU
 
-            self.screen.fill(UI_BG)
+            self.profiler.lap("events")
+            dirty = None
+            incremental = self.state == STATE_PLAYING and DIRTY_RECT_RENDERING
+            if not incremental: self.frame_valid = False
             
             if self.state == STATE_MENU:
                 self.draw_menu(mouse_pos)
@@ -290,10 +425,9 @@ class GameManager:
                 self.draw_input_names(mouse_pos)
             elif self.state == STATE_PLAYING:
                 self.update_game_logic(mouse_pos)
-                self.draw_game(mouse_pos)
+                if incremental: dirty = self.draw_game_dirty(mouse_pos)
+                else: self.draw_game(mouse_pos)
             elif self.state == STATE_PAUSED:
-                self.update_game_logic(mouse_pos)
-                self.draw_game(mouse_pos)
                 self.draw_paused(mouse_pos)
             elif self.state == STATE_GAME_OVER:
                 self.draw_game_over(mouse_pos)
@@ -305,44 +439,94 @@ class GameManager:
                 self.draw_settings(mouse_pos)
             elif self.state == STATE_LEADERBOARD:
                 self.draw_leaderboard(mouse_pos)
+            self.profiler.lap("ui")  # layar selain permainan (fase permainan sudah di-lap di dalam)
 
-            if DEBUG_MODE: self.draw_debug_info()
+            # Area overlay sudah disusun ulang oleh draw_game_dirty (lihat overlay_rects)
+            if DEBUG_MODE:
+                self.draw_debug_info()
+            if self.profiler.overlay:
+                self.profiler.draw(self.screen, self.debug_font)
+            self.profiler.lap("overlay")
             
             self.clock.tick(FPS)
-            pygame.display.flip()
+            self.profiler.lap("wait")
+            if dirty is None: pygame.display.flip()
+            else: pygame.display.update(dirty)
+            self.profiler.lap("flip")
+
+            self.sound_manager.flush()
+            self.profiler.lap("sound")
+            self.profiler.end_frame(self.state)
+
+            if not self.first_frame_shown:
+                self.first_frame_shown = True
+                self.mark_startup("first frame")
+                if STARTUP_REPORT or DEBUG_MODE: self.report_startup()
+
+            self.idle = IDLE_MODE and not events and not self.is_animating() and not self.sound_manager.pending
+            if self.idle or self.state != STATE_PLAYING:
+                self.last_update = None  # Waktu di luar permainan/idle tidak dihitung sebagai waktu fisika
+            self.update_cpu_usage()
+
+    def poll_events(self):
+        """Saat idle, blok di event.wait (dengan timeout) alih-alih berputar di clock.tick."""
+        if not self.idle:
+            return pygame.event.get()
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def is_animating(self):
+        """True jika frame berikutnya bisa berubah tanpa input (bola bergerak, pesan, giliran CPU)."""
+        if self.state != STATE_PLAYING: return False
+        return self.is_moving or self.message_timer > 0 or self.is_cpu_turn()
+
+    def update_cpu_usage(self):
+        """Persentase waktu CPU proses utama terhadap waktu nyata, diperbarui tiap detik."""
+        now = time.perf_counter()
+        elapsed = now - self.cpu_sample[0]
+        if elapsed >= 1.0:
+            cpu = time.process_time()
+            self.cpu_usage = (cpu - self.cpu_sample[1]) / elapsed * 100
+            self.cpu_sample = (now, cpu)
 
     def update_game_logic(self, mouse_pos):
         if self.state == STATE_PAUSED: return
 
         if not self.is_moving:
-            self.cue.update(mouse_pos)
-        
-        physics_steps = 10 
-        for _ in range(physics_steps):
-            for ball in self.balls:
-                if ball.potted: continue
-                ball.pos += ball.velocity / physics_steps
-                ball.check_wall_collision(self.table.rect)
-                if ball.check_pocket_collision(self.table.pockets):
-                    self.sound_manager.play('pocket')
-                    self.handle_pot(ball)
-            
-            for i in range(len(self.balls)):
-                for j in range(i + 1, len(self.balls)):
-                    b1 = self.balls[i]
-                    b2 = self.balls[j]
-                    if PhysicsEngine.resolve_collision(b1, b2):
-                        impact = (b1.velocity - b2.velocity).length()
-                        if impact > 1: self.sound_manager.play('hit')
-
-        moving_count = 0
-        for ball in self.balls:
-            if ball.potted: continue
-            if ball.velocity.length() > 0.05:
-                ball.velocity *= ball.friction
-                moving_count += 1
-            else:
-                ball.velocity = pygame.math.Vector2(0, 0)
+            if self.is_cpu_turn(): self.update_cpu_turn()
+            else: self.cue.update(mouse_pos)
+
+        # Fixed timestep: fisika maju per tick PHYSICS_DT, tidak tergantung frame rate render
+        now = time.perf_counter()
+        if self.last_update is not None:
+            self.accumulator += min(now - self.last_update, MAX_FRAME_TIME)
+        else:
+            self.accumulator = max(self.accumulator, PHYSICS_DT)
+        self.last_update = now
+
+        self.ticks_this_frame = 0
+        self.profiler.lap("update")
+        if self.turbo and self.is_moving:
+            # Turbo: tick sebanyak yang muat di anggaran waktu frame
+            deadline = now + TURBO_FRAME_BUDGET
+            while self.is_moving and self.state == STATE_PLAYING and time.perf_counter() < deadline:
+                self.physics_tick()
+            self.accumulator = 0.0
+        else:
+            while self.accumulator >= PHYSICS_DT and self.state == STATE_PLAYING:
+                if self.ticks_this_frame == MAX_PHYSICS_TICKS:
+                    self.accumulator = 0.0  # Tertinggal terlalu jauh: buang sisa, jangan kejar
+                    break
+                self.physics_tick()
+                self.accumulator -= PHYSICS_DT
+
+    def physics_tick(self):
+        self.prev_positions = self.sim.positions()
+        moving_count = self.sim.step()
+        self.ticks_this_frame += 1
+        self.profiler.substep()
 
         if self.is_moving and moving_count == 0:
             self.is_moving = False
@@ -352,10 +536,57 @@ class GameManager:
             
         if self.message_timer > 0: self.message_timer -= 1
 
+    def render_positions(self):
+        """Posisi bola untuk render, diinterpolasi antara dua state fisika terakhir."""
+        alpha = 1.0 if self.turbo else min(self.accumulator / PHYSICS_DT, 1.0)
+        self.sim.sync()
+        positions = []
+        for ball, (px, py) in zip(self.balls, self.prev_positions):
+            x, y = ball.pos.x, ball.pos.y
+            # Lompatan besar (bola putih di-reset setelah foul) tidak diinterpolasi
+            if abs(x - px) + abs(y - py) < BALL_RADIUS * 4:
+                x = px + (x - px) * alpha
+                y = py + (y - py) * alpha
+            positions.append((x, y))
+        return positions
+
+    def is_cpu_turn(self):
+        return self.vs_cpu and self.turn == 2 and self.state == STATE_PLAYING
+
+    def update_cpu_turn(self):
+        """Giliran komputer: pencarian tembakan berjalan di process pool, di sini hanya polling."""
+        if not self.ai.active:
+            self.ai.start(self.balls, self.table.bounds, self.table.pockets, self.player_assignments[self.turn])
+        shot = self.ai.poll()
+        angle = self.ai.best_angle()
+        if angle is not None: self.cue.angle = angle
+        if shot:
+            self.cue.angle, self.cue.power = shot
+            self.cue.shoot()
+            self.cue.state = 0
+            self.is_moving = True
+            self.shots[self.turn] += 1
+            self.sound_manager.queue('hit', self.cue.power / self.cue.max_power)
+
+    def quit_game(self):
+        self.ai.shutdown()
+        self.profiler.close()
+        self.leaderboard.close()
+        pygame.quit()
+        sys.exit()
+
+    def on_ball_potted(self, ball):
+        self.sound_manager.queue('pocket')
+        self.handle_pot(ball)
+
+    def on_ball_collision(self, ball1, ball2, impact):
+        if impact > 1: self.sound_manager.queue('hit', impact / SOUND_FULL_IMPACT)
+
     def handle_pot(self, ball):
         if ball.type == "cue":
             self.ball_potted_this_turn = False
             self.message = "FOUL! Cue Ball Potted"
+            self.fouls[self.turn] += 1
             ball.reset()
         elif ball.type == "eight":
             current_player = self.turn
@@ -374,13 +605,12 @@ class GameManager:
                 winner_id = current_player
                 self.winner_name = self.p1_name if winner_id == 1 else self.p2_name
                 self.winner_text = f"VICTORY! {self.winner_name.upper()} WINS!"
-                self.leaderboard.add_win(self.winner_name)
             else:
                 winner_id = 2 if current_player == 1 else 1
                 self.winner_name = self.p1_name if winner_id == 1 else self.p2_name
                 self.winner_text = f"GAME OVER! {self.winner_name.upper()} WINS!"
-                self.leaderboard.add_win(self.winner_name)
-                
+
+            self.record_match()
             self.state = STATE_GAME_OVER
         else:
             if self.player_assignments[1] is None:
@@ -399,6 +629,13 @@ class GameManager:
                 self.scores[opponent].append(ball)
                 self.ball_potted_this_turn = False
 
+    def record_match(self):
+        """Mengirim hasil pertandingan ke leaderboard (ditulis di thread latar)."""
+        self.leaderboard.record_match(make_match(
+            self.p1_name, self.p2_name, self.winner_name,
+            shots=(self.shots[1], self.shots[2]), fouls=(self.fouls[1], self.fouls[2]),
+            duration=time.perf_counter() - self.match_start))
+
     def switch_turn(self):
         player_name = self.p1_name if self.turn == 2 else self.p2_name
         if not self.ball_potted_this_turn:
@@ -411,14 +648,30 @@ class GameManager:
         self.message_timer = 60
         self.ball_potted_this_turn = False
 
+    def cached_screen(self, name, key, render):
+        """
+        Layar penuh yang dirender sekali lalu dipakai ulang selama `key` tidak berubah.
+        render(surface) menggambar konten statis di atas latar UI_BG.
+        """
+        entry = self.screen_cache.get(name)
+        if entry is None or entry[0] != key:
+            surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+            surf.fill(UI_BG)
+            render(surf)
+            entry = self.screen_cache[name] = (key, surf)
+        self.screen.blit(entry[1], (0, 0))
+
     def draw_menu(self, mouse_pos):
-        title = self.title_font.render("BILLIARD MASTER", True, WHITE)
-        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 100))
+        self.cached_screen("menu", None, self.render_menu)
         
         for btn in [self.btn_start, self.btn_leaderboard, self.btn_tutorial, self.btn_team, self.btn_settings, self.btn_quit]:
             btn.check_hover(mouse_pos)
             btn.draw(self.screen)
 
+    def render_menu(self, surface):
+        title = render_text(self.title_font, "BILLIARD MASTER", True, WHITE)
+        surface.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 100))
+
     def draw_input_names(self, mouse_pos):
         self.draw_panel("ENTER PLAYER NAMES", height=400)
         
@@ -431,61 +684,89 @@ class GameManager:
         self.btn_back_panel.check_hover(mouse_pos)
         self.btn_back_panel.draw(self.screen)
 
+    def reset_leaderboard_pages(self):
+        self.leaderboard_cursors = [None]
+        self.leaderboard_page = 0
+        self.leaderboard_version = self.leaderboard.version
+
+    def has_next_page(self):
+        return len(self.leaderboard_cursors) > self.leaderboard_page + 1
+
     def draw_leaderboard(self, mouse_pos):
-        x, y, w, h = self.draw_panel("TOP PLAYERS", height=500)
-        
-        top_players = self.leaderboard.get_top_players(5)
+        # Data berubah: cursor lama tidak berlaku lagi, kembali ke halaman pertama
+        if self.leaderboard.version != self.leaderboard_version: self.reset_leaderboard_pages()
+        key = (self.leaderboard.version, self.leaderboard_page)
+        self.draw_panel("TOP PLAYERS", height=500, key=key, content=self.render_leaderboard)
+        buttons = [self.btn_back_panel]
+        if self.leaderboard_page > 0: buttons.append(self.btn_prev_page)
+        if self.has_next_page(): buttons.append(self.btn_next_page)
+        for btn in buttons:
+            btn.check_hover(mouse_pos)
+            btn.draw(self.screen)
+
+    def render_leaderboard(self, surface, x, y, w, h):
+        # Hanya satu halaman yang diambil dari leaderboard, dan hanya saat cache panel dibangun ulang
+        page = self.leaderboard_page
+        players, next_cursor = self.leaderboard.get_page(LEADERBOARD_PAGE_SIZE, self.leaderboard_cursors[page])
+        if next_cursor is not None and not self.has_next_page():
+            self.leaderboard_cursors.append(next_cursor)
         
         start_y = y + 100
-        headers = ["Rank", "Name", "Wins"]
-        gx = [x + 50, x + 150, x + 450]
+        headers = ["Rank", "Name", "Wins", "Games", "Win%"]
+        gx = [x + 40, x + 120, x + 330, x + 410, x + 500]
         for i, h_text in enumerate(headers):
-            surf = self.font.render(h_text, True, ACCENT_COLOR)
-            self.screen.blit(surf, (gx[i], start_y))
+            surf = render_text(self.font, h_text, True, ACCENT_COLOR)
+            surface.blit(surf, (gx[i], start_y))
             
         start_y += 30
-        pygame.draw.line(self.screen, GREY, (x + 30, start_y), (x + w - 30, start_y), 1)
+        pygame.draw.line(surface, GREY, (x + 30, start_y), (x + w - 30, start_y), 1)
         start_y += 10
         
-        if not top_players:
-            txt = self.font.render("No records yet.", True, GREY)
-            self.screen.blit(txt, (x + w//2 - txt.get_width()//2, start_y + 20))
+        if not players:
+            txt = render_text(self.font, "No records yet.", True, GREY)
+            surface.blit(txt, (x + w//2 - txt.get_width()//2, start_y + 20))
         else:
-            for i, player in enumerate(top_players):
-                col = YELLOW if i == 0 else WHITE
+            for player in players:
+                col = YELLOW if player['rank'] == 1 else WHITE
                 
-                rank_txt = self.font.render(f"#{i+1}", True, col)
-                name_txt = self.font.render(player['name'], True, col)
-                wins_txt = self.font.render(str(player['wins']), True, col)
+                columns = [f"#{player['rank']}", player['name'], str(player['wins']),
+                           str(player['games']), f"{player['win_rate'] * 100:.0f}%"]
+                for gx_i, text in zip(gx, columns):
+                    surface.blit(render_text(self.font, text, True, col), (gx_i, start_y))
                 
-                self.screen.blit(rank_txt, (gx[0], start_y))
-                self.screen.blit(name_txt, (gx[1], start_y))
-                self.screen.blit(wins_txt, (gx[2], start_y))
-                
-                start_y += 40
+                start_y += 36
 
-        self.btn_back_panel.check_hover(mouse_pos)
-        self.btn_back_panel.draw(self.screen)
+        if page > 0 or next_cursor is not None:
+            txt = render_text(self.font, f"Page {page + 1}", True, GREY)
+            surface.blit(txt, (x + w//2 - txt.get_width()//2, y + 410))
 
-    def draw_panel(self, title, height=450):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0,0))
-        
+    def draw_panel(self, title, height=450, key=None, content=None):
+        """
+        Latar gelap, panel dan judul (plus konten statis opsional) dirender sekali ke cache.
+        content(surface, x, y, w, h) dipanggil saat cache dibangun ulang, yaitu saat `key` berubah.
+        """
         panel_w, panel_h = 600, height
         panel_x = (SCREEN_WIDTH - panel_w) // 2
         panel_y = (SCREEN_HEIGHT - panel_h) // 2
-        
-        pygame.draw.rect(self.screen, (10, 10, 10), (panel_x + 5, panel_y + 5, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, DARK_GREY, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, ACCENT_COLOR, (panel_x, panel_y, panel_w, panel_h), 2, border_radius=15)
-        
-        title_surf = self.header_font.render(title, True, ACCENT_COLOR)
-        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH//2, panel_y + 40))
-        self.screen.blit(title_surf, title_rect)
-        
-        pygame.draw.line(self.screen, GREY, (panel_x + 50, panel_y + 70), (panel_x + panel_w - 50, panel_y + 70), 2)
+
+        def render(surface):
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.set_alpha(150)
+            overlay.fill(BLACK)
+            surface.blit(overlay, (0,0))
+            
+            pygame.draw.rect(surface, (10, 10, 10), (panel_x + 5, panel_y + 5, panel_w, panel_h), border_radius=15)
+            pygame.draw.rect(surface, DARK_GREY, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
+            pygame.draw.rect(surface, ACCENT_COLOR, (panel_x, panel_y, panel_w, panel_h), 2, border_radius=15)
+            
+            title_surf = render_text(self.header_font, title, True, ACCENT_COLOR)
+            title_rect = title_surf.get_rect(center=(SCREEN_WIDTH//2, panel_y + 40))
+            surface.blit(title_surf, title_rect)
+            
+            pygame.draw.line(surface, GREY, (panel_x + 50, panel_y + 70), (panel_x + panel_w - 50, panel_y + 70), 2)
+            if content: content(surface, panel_x, panel_y, panel_w, panel_h)
+
+        self.cached_screen(("panel", title), (height, key), render)
         return panel_x, panel_y, panel_w, panel_h
 
     def draw_settings(self, mouse_pos):
@@ -494,11 +775,17 @@ class GameManager:
         self.btn_toggle_sound.draw(self.screen)
         self.btn_sensitivity.check_hover(mouse_pos)
         self.btn_sensitivity.draw(self.screen)
+        self.btn_opponent.check_hover(mouse_pos)
+        self.btn_opponent.draw(self.screen)
         self.btn_back_panel.check_hover(mouse_pos)
         self.btn_back_panel.draw(self.screen)
 
     def draw_tutorial(self, mouse_pos):
-        panel_x, panel_y, _, _ = self.draw_panel("HOW TO PLAY")
+        self.draw_panel("HOW TO PLAY", content=self.render_tutorial)
+        self.btn_back_panel.check_hover(mouse_pos)
+        self.btn_back_panel.draw(self.screen)
+
+    def render_tutorial(self, surface, panel_x, panel_y, panel_w, panel_h):
         lines = [
             ("Arahkan Mouse", "Untuk membidik bola sasaran."),
             ("Klik Kiri (1x)", "Mengunci arah (Aim Lock)."),
@@ -508,16 +795,18 @@ class GameManager:
         ]
         start_y_text = panel_y + 100
         for action, desc in lines:
-            act_surf = self.font.render(action, True, ACCENT_COLOR)
-            self.screen.blit(act_surf, (panel_x + 50, start_y_text))
-            desc_surf = self.font.render(f":  {desc}", True, WHITE)
-            self.screen.blit(desc_surf, (panel_x + 200, start_y_text))
+            act_surf = render_text(self.font, action, True, ACCENT_COLOR)
+            surface.blit(act_surf, (panel_x + 50, start_y_text))
+            desc_surf = render_text(self.font, f":  {desc}", True, WHITE)
+            surface.blit(desc_surf, (panel_x + 200, start_y_text))
             start_y_text += 40
+
+    def draw_team(self, mouse_pos):
+        self.draw_panel("OUR TEAM", content=self.render_team)
         self.btn_back_panel.check_hover(mouse_pos)
         self.btn_back_panel.draw(self.screen)
 
-    def draw_team(self, mouse_pos):
-        _, panel_y, _, _ = self.draw_panel("OUR TEAM")
+    def render_team(self, surface, panel_x, panel_y, panel_w, panel_h):
         team_members = [
             "Muhammad Daffa Ramdhani (1313624025)",
             "Ricky Darmawan (1313624007)",
@@ -525,57 +814,153 @@ class GameManager:
         ]
         start_y_text = panel_y + 120
         for member in team_members:
-            txt_surf = self.font.render(member, True, WHITE)
+            txt_surf = render_text(self.font, member, True, WHITE)
             txt_rect = txt_surf.get_rect(center=(SCREEN_WIDTH//2, start_y_text))
-            self.screen.blit(txt_surf, txt_rect)
+            surface.blit(txt_surf, txt_rect)
             start_y_text += 45
-        self.btn_back_panel.check_hover(mouse_pos)
-        self.btn_back_panel.draw(self.screen)
+
+    def build_background(self):
+        """Layer statis (latar, bar HUD, bingkai power bar, meja) yang dirender sekali per meja."""
+        bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        bg.fill(UI_BG)
+        pygame.draw.rect(bg, DARK_GREY, self.hud_rect)
+        pygame.draw.rect(bg, BLACK, self.power_bar_rect, border_radius=5)
+        pygame.draw.rect(bg, WHITE, self.power_bar_rect, 2, border_radius=5)
+        self.table.draw(bg)
+        self.background = bg
+        self.frame_valid = False
 
     def draw_game(self, mouse_pos):
-        pygame.draw.rect(self.screen, DARK_GREY, (0, 0, SCREEN_WIDTH, 80))
-        
+        self.screen.blit(self.background, (0, 0))
+        self.profiler.lap("table")
+        self.draw_hud()
+        self.profiler.lap("hud")
+        self.cue_rect, self.msg_rect = self.draw_table_layer(self.render_positions())
+        self.btn_pause_game.check_hover(mouse_pos)
+        self.btn_pause_game.draw(self.screen)
+        self.profiler.lap("hud")
+
+    def draw_game_dirty(self, mouse_pos):
+        """
+        Render inkremental saat bermain. Hanya elemen yang berubah (bola yang bergerak, stik,
+        pesan, widget HUD) yang dipulihkan dari layer statis lalu digambar ulang.
+        Mengembalikan daftar rect untuk display.update, atau None jika frame digambar penuh.
+        """
+        self.btn_pause_game.check_hover(mouse_pos)
+        positions = self.render_positions()
+        ball_keys = [None if b.potted else (int(x), int(y)) for b, (x, y) in zip(self.balls, positions)]
+        cue_key = None if self.is_moving else (self.cue.angle, self.cue.power, self.sim.version, ball_keys[0])
+        msg_key = self.message if self.message_timer > 0 else None
+        hud_key = (self.turn, self.player_assignments[1], self.player_assignments[2],
+                   self.p1_name, self.p2_name, tuple(key is None for key in ball_keys))
+        power_key = self.cue.power
+        pause_key = self.btn_pause_game.is_hovered
+
+        if not self.frame_valid:
+            self.draw_game(mouse_pos)
+            dirty = None
+        else:
+            changed = [i for i, key in enumerate(ball_keys) if key != self.ball_keys[i]]
+            restore = [self.ball_rect(self.ball_keys[i]) for i in changed if self.ball_keys[i]]
+            cue_changed = cue_key != self.cue_key
+            msg_changed = msg_key != self.msg_key
+            if cue_changed and self.cue_rect: restore.append(self.cue_rect)
+            if msg_changed and self.msg_rect: restore.append(self.msg_rect)
+            restore.extend(self.overlay_rects())
+
+            for rect in restore:
+                self.screen.blit(self.background, rect, rect)
+            dirty = restore
+            self.profiler.lap("table")
+
+            if hud_key != self.hud_key or any(self.hud_rect.colliderect(r) for r in restore):
+                self.screen.blit(self.background, self.hud_rect, self.hud_rect)
+                self.draw_hud()
+                dirty.append(self.hud_rect)
+            elif power_key != self.power_key:
+                self.screen.blit(self.background, self.power_bar_rect, self.power_bar_rect)
+                self.draw_power_bar()
+                dirty.append(self.power_bar_rect)
+            self.profiler.lap("hud")
+
+            if dirty or changed or cue_changed or msg_changed:
+                # Bola/stik lain yang tertimpa area yang dipulihkan ikut tergambar ulang di sini
+                self.cue_rect, self.msg_rect = self.draw_table_layer(positions)
+                dirty.extend(self.ball_rect(ball_keys[i]) for i in changed if ball_keys[i])
+                if cue_changed and self.cue_rect: dirty.append(self.cue_rect)
+                if msg_changed and self.msg_rect: dirty.append(self.msg_rect)
+
+            if pause_key != self.pause_key or any(self.pause_rect.colliderect(r) for r in dirty):
+                self.btn_pause_game.draw(self.screen)
+                dirty.append(self.pause_rect)
+            self.profiler.lap("hud")
+
+        self.ball_keys, self.cue_key, self.msg_key = ball_keys, cue_key, msg_key
+        self.hud_key, self.power_key, self.pause_key = hud_key, power_key, pause_key
+        self.frame_valid = True
+        return dirty
+
+    def overlay_rects(self):
+        """
+        Area overlay (debug, profiler) yang digambar di atas frame jadi. Setiap frame area ini
+        dipulihkan dan bola/stik di bawahnya digambar ulang, supaya overlay transparan tidak
+        menumpuk dan tidak menghapus isi meja.
+        """
+        rects = []
+        if DEBUG_MODE: rects.append(self.debug_rect)
+        if self.profiler.overlay: rects.append(self.profiler.rect)
+        return rects
+
+    def ball_rect(self, key):
+        off = self.sprites.table_offset
+        return pygame.Rect(key[0] - off, key[1] - off, off * 2, off * 2)
+
+    def draw_hud(self):
         p1_type = self.player_assignments[1] if self.player_assignments[1] else "OPEN"
         p1_col = ACCENT_COLOR if self.turn == 1 else GREY
-        p1_txt = self.font.render(f"{self.p1_name} ({p1_type.upper()})", True, p1_col)
+        p1_txt = render_text(self.font, f"{self.p1_name} ({p1_type.upper()})", True, p1_col)
         self.screen.blit(p1_txt, (50, 20))
         if self.turn == 1: pygame.draw.circle(self.screen, ACCENT_COLOR, (30, 30), 5)
         self.draw_remaining_balls(1, 50, 55, align_left=True)
             
         p2_type = self.player_assignments[2] if self.player_assignments[2] else "OPEN"
         p2_col = ACCENT_COLOR if self.turn == 2 else GREY
-        p2_txt = self.font.render(f"{self.p2_name} ({p2_type.upper()})", True, p2_col)
+        p2_txt = render_text(self.font, f"{self.p2_name} ({p2_type.upper()})", True, p2_col)
         p2_rect = p2_txt.get_rect(topright=(SCREEN_WIDTH - 150, 20))
         self.screen.blit(p2_txt, p2_rect)
         if self.turn == 2: pygame.draw.circle(self.screen, ACCENT_COLOR, (SCREEN_WIDTH - 30, 30), 5)
         self.draw_remaining_balls(2, SCREEN_WIDTH - 150, 55, align_left=False)
 
-        bar_x, bar_y = SCREEN_WIDTH // 2 - 100, 25
-        bar_w, bar_h = 200, 30
-        pygame.draw.rect(self.screen, BLACK, (bar_x, bar_y, bar_w, bar_h), border_radius=5)
-        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_w, bar_h), 2, border_radius=5)
+        self.draw_power_bar()
+
+    def draw_power_bar(self):
+        bar_x, bar_y, bar_w, bar_h = self.power_bar_rect
         ratio = self.cue.power / self.cue.max_power
         if ratio > 0:
             fill_w = int((bar_w - 4) * ratio)
             fill_color = (255, int(255 * (1 - ratio)), 0) 
             pygame.draw.rect(self.screen, fill_color, (bar_x + 2, bar_y + 2, fill_w, bar_h - 4), border_radius=3)
-        pow_txt = self.ball_font.render("POWER", True, WHITE)
+        pow_txt = render_text(self.ball_font, "POWER", True, WHITE)
         self.screen.blit(pow_txt, (bar_x + bar_w // 2 - pow_txt.get_width() // 2, bar_y + 8))
 
-        self.table.draw(self.screen)
-        for ball in self.balls: ball.draw(self.screen, self.ball_font)
+    def draw_table_layer(self, positions):
+        """Bola, stik dan pesan di atas meja. Mengembalikan (rect stik, rect pesan)."""
+        cue_rect = msg_rect = None
+        self.sprites.draw_balls(self.screen, self.balls, positions)
+        self.profiler.lap("balls")
         if not self.is_moving and self.state != STATE_PAUSED:
-            self.cue.draw(self.screen, self.balls, self.table.rect)
+            cue_rect = self.cue.draw(self.screen, self.balls, self.table.rect, self.sim.version)
+            self.profiler.lap("cue")
             
         if self.message_timer > 0:
-            msg_surf = self.title_font.render(self.message, True, WHITE)
+            msg_surf = render_text(self.title_font, self.message, True, WHITE)
             msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             bg_rect = msg_rect.inflate(40, 20)
             pygame.draw.rect(self.screen, (0,0,0,180), bg_rect, border_radius=10)
             self.screen.blit(msg_surf, msg_rect)
-            
-        self.btn_pause_game.check_hover(mouse_pos)
-        self.btn_pause_game.draw(self.screen)
+            msg_rect = bg_rect
+            self.profiler.lap("hud")
+        return cue_rect, msg_rect
 
     def draw_remaining_balls(self, player_num, start_x, start_y, align_left=True):
         p_type = self.player_assignments[player_num]
@@ -583,53 +968,68 @@ class GameManager:
             target_nums = list(range(1, 8)) if player_num == 1 else list(range(9, 16))
         else:
             target_nums = list(range(1, 8)) if p_type == 'solid' else list(range(9, 16))
-        balls_to_draw = [num for num in target_nums if next((b for b in self.balls if b.number == num and not b.potted), None)]
+        on_table = {b.number for b in self.balls if not b.potted}
+        balls_to_draw = [num for num in target_nums if num in on_table]
         
         spacing = 25
-        for i, num in enumerate(balls_to_draw):
-            color = self.ball_colors.get(num, WHITE)
+        positions = []
+        for i in range(len(balls_to_draw)):
             pos_x = start_x + (i * spacing) if align_left else start_x - (i * spacing)
-            pygame.draw.circle(self.screen, color, (pos_x, start_y), 10)
-            if num > 8:
-                pygame.draw.circle(self.screen, WHITE, (pos_x, start_y), 7)
-                pygame.draw.rect(self.screen, color, (pos_x - 8, start_y - 3, 16, 6))
-            txt = self.ui_ball_font.render(str(num), True, BLACK)
-            txt_rect = txt.get_rect(center=(pos_x, start_y))
-            self.screen.blit(txt, txt_rect)
+            positions.append((pos_x, start_y))
+        self.sprites.draw_hud_balls(self.screen, balls_to_draw, positions)
 
     def draw_paused(self, mouse_pos):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0,0))
-        text = self.title_font.render("GAME PAUSED", True, WHITE)
-        rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 120))
-        self.screen.blit(text, rect)
+        # Frame permainan dibekukan sekali saat pause; selanjutnya cukup blit snapshot + tombol
+        if self.pause_snapshot is None:
+            self.draw_game(mouse_pos)
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.set_alpha(150)
+            overlay.fill(BLACK)
+            self.screen.blit(overlay, (0,0))
+            text = render_text(self.title_font, "GAME PAUSED", True, WHITE)
+            rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 120))
+            self.screen.blit(text, rect)
+            self.pause_snapshot = self.screen.copy()
+        else:
+            self.screen.blit(self.pause_snapshot, (0, 0))
         
         for btn in [self.btn_resume, self.btn_restart, self.btn_exit_to_menu]:
             btn.check_hover(mouse_pos)
             btn.draw(self.screen)
 
     def draw_game_over(self, mouse_pos):
+        self.cached_screen("game_over", self.winner_text, self.render_game_over)
+        
+        for btn in [self.btn_play_again, self.btn_main_menu]:
+            btn.check_hover(mouse_pos)
+            btn.draw(self.screen)
+
+    def render_game_over(self, surface):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(200)
         overlay.fill(BLACK)
-        self.screen.blit(overlay, (0,0))
+        surface.blit(overlay, (0,0))
         
         color = GREEN if "VICTORY" in self.winner_text else RED
-        text = self.title_font.render(self.winner_text, True, color)
+        text = render_text(self.title_font, self.winner_text, True, color)
         rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
-        self.screen.blit(text, rect)
-        
-        for btn in [self.btn_play_again, self.btn_main_menu]:
-            btn.check_hover(mouse_pos)
-            btn.draw(self.screen)
+        surface.blit(text, rect)
 
     def draw_debug_info(self):
         fps = int(self.clock.get_fps())
         fps_text = self.debug_font.render(f"FPS: {fps}", True, GREEN)
         self.screen.blit(fps_text, (10, SCREEN_HEIGHT - 30))
+        sub_text = self.debug_font.render(
+            f"Substeps: {self.sim.last_substeps} (total {self.sim.substeps_taken})  "
+            f"Ticks/frame: {self.ticks_this_frame}{' TURBO' if self.turbo else ''}", True, GREEN)
+        self.screen.blit(sub_text, (10, SCREEN_HEIGHT - 50))
+        cache_text = self.debug_font.render(
+            f"Text cache: {text_cache.hits} hit / {text_cache.misses} miss ({text_cache.hit_rate():.0%})", True, GREEN)
+        self.screen.blit(cache_text, (10, SCREEN_HEIGHT - 70))
+        cpu_text = self.debug_font.render(f"CPU: {self.cpu_usage:.0f}% ({'idle' if self.idle else 'active'})", True, GREEN)
+        self.screen.blit(cpu_text, (10, SCREEN_HEIGHT - 90))
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     game = GameManager()
     game.run()
\ No newline at end of file
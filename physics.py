@@ -1,11 +1,11 @@
 import math
-import pygame # type: ignore
 
 class PhysicsEngine:
     """
     Menangani logika fisika permainan biliar, termasuk:
     1. Deteksi tumbukan antar bola (Collision Resolution).
-    2. Raycasting untuk prediksi lintasan bola dan stik.
+    2. Solver kontak serentak untuk kelompok bola yang saling bersentuhan (rack).
+    3. Raycasting untuk prediksi lintasan bola dan stik.
     """
 
     @staticmethod
@@ -27,23 +27,7 @@ class PhysicsEngine:
             nx = dx / distance
             ny = dy / distance
 
-            tx = -ny
-            ty = nx
-
-            v1n = ball1.velocity.x * nx + ball1.velocity.y * ny
-            v1t = ball1.velocity.x * tx + ball1.velocity.y * ty
-            
-            v2n = ball2.velocity.x * nx + ball2.velocity.y * ny
-            v2t = ball2.velocity.x * tx + ball2.velocity.y * ty
-
-            v1n_final = v2n
-            v2n_final = v1n
-
-            ball1.velocity.x = v1n_final * nx + v1t * tx
-            ball1.velocity.y = v1n_final * ny + v1t * ty
-            
-            ball2.velocity.x = v2n_final * nx + v2t * tx
-            ball2.velocity.y = v2n_final * ny + v2t * ty
+            PhysicsEngine.exchange_normal_velocity(ball1, ball2, nx, ny)
 
             overlap = (ball1.radius + ball2.radius - distance) / 2.0
             ball1.pos.x += nx * overlap
@@ -54,6 +38,109 @@ class PhysicsEngine:
             return True
         return False
 
+    @staticmethod
+    def exchange_normal_velocity(ball1, ball2, nx, ny):
+        """
+        Menukar komponen kecepatan normal dua bola bermassa sama (tumbukan elastis),
+        sementara komponen tangensial tetap. (nx, ny) adalah normal satuan dari ball2 ke ball1.
+        """
+        tx = -ny
+        ty = nx
+
+        v1n = ball1.velocity.x * nx + ball1.velocity.y * ny
+        v1t = ball1.velocity.x * tx + ball1.velocity.y * ty
+        
+        v2n = ball2.velocity.x * nx + ball2.velocity.y * ny
+        v2t = ball2.velocity.x * tx + ball2.velocity.y * ty
+
+        v1n_final = v2n
+        v2n_final = v1n
+
+        ball1.velocity.x = v1n_final * nx + v1t * tx
+        ball1.velocity.y = v1n_final * ny + v1t * ty
+        
+        ball2.velocity.x = v2n_final * nx + v2t * tx
+        ball2.velocity.y = v2n_final * ny + v2t * ty
+
+    @staticmethod
+    def solve_contacts(balls, pairs, iterations=4, active=None):
+        """
+        Menyelesaikan semua kontak sekaligus (Jacobi / impuls serentak), bukan per pasangan.
+        Setiap iterasi menghitung impuls semua pasangan yang saling mendekat dari keadaan
+        kecepatan yang sama, lalu menerapkannya bersamaan; impuls dibagi dengan jumlah kontak
+        aktif bola terpadat pada pasangan itu (mass splitting) agar tetap stabil dan momentum
+        kekal. Hasilnya tidak bergantung pada urutan pasangan.
+        Jika `active` (set indeks) diberikan, pasangan yang keduanya tidak aktif dilewati.
+
+        Mengembalikan (kontak, impuls, iterasi): semua pasangan indeks (i, j) yang overlap,
+        pasangan yang menerima impuls, dan jumlah iterasi kecepatan yang dijalankan.
+        """
+        contacts = []
+        for i, j in pairs:
+            if active is not None and i not in active and j not in active: continue
+            b1, b2 = balls[i], balls[j]
+            if b1.potted or b2.potted: continue
+            dx = b1.pos.x - b2.pos.x
+            dy = b1.pos.y - b2.pos.y
+            reach = b1.radius + b2.radius
+            if dx * dx + dy * dy < reach * reach:
+                contacts.append((i, j))
+        if not contacts:
+            return [], [], 0
+
+        normals = []
+        for i, j in contacts:
+            b1, b2 = balls[i], balls[j]
+            dx = b1.pos.x - b2.pos.x
+            dy = b1.pos.y - b2.pos.y
+            distance = math.hypot(dx, dy) or 0.001
+            normals.append((dx / distance, dy / distance))
+
+        touched = set()
+        passes = 0
+        for _ in range(iterations):
+            impulses = []
+            counts = {}
+            for (i, j), (nx, ny) in zip(contacts, normals):
+                v1, v2 = balls[i].velocity, balls[j].velocity
+                approach = (v1.x - v2.x) * nx + (v1.y - v2.y) * ny
+                if approach < 0:
+                    impulses.append((i, j, nx, ny, approach))
+                    counts[i] = counts.get(i, 0) + 1
+                    counts[j] = counts.get(j, 0) + 1
+            if not impulses: break
+            passes += 1
+            for i, j, nx, ny, approach in impulses:
+                share = approach / max(counts[i], counts[j])
+                v1, v2 = balls[i].velocity, balls[j].velocity
+                v1.x -= share * nx
+                v1.y -= share * ny
+                v2.x += share * nx
+                v2.y += share * ny
+                touched.add((i, j))
+
+        for _ in range(iterations):
+            shifts = {}
+            for i, j in contacts:
+                b1, b2 = balls[i], balls[j]
+                dx = b1.pos.x - b2.pos.x
+                dy = b1.pos.y - b2.pos.y
+                distance = math.hypot(dx, dy) or 0.001
+                depth = b1.radius + b2.radius - distance
+                if depth <= 0: continue
+                push = depth / 2.0
+                nx, ny = dx / distance * push, dy / distance * push
+                s1 = shifts.setdefault(i, [0.0, 0.0, 0])
+                s2 = shifts.setdefault(j, [0.0, 0.0, 0])
+                s1[0] += nx; s1[1] += ny; s1[2] += 1
+                s2[0] -= nx; s2[1] -= ny; s2[2] += 1
+            if not shifts: break
+            for index, (sx, sy, count) in shifts.items():
+                balls[index].pos.x += sx / count
+                balls[index].pos.y += sy / count
+
+        return contacts, sorted(touched), passes
+
     @staticmethod
     def ray_cast_ball(start_pos, direction_vector, balls):
         closest_dist = float('inf')
@@ -0,0 +1,173 @@
+import csv
+import math
+import os
+import time
+from collections import deque
+import pygame # type: ignore
+from config import *
+
+# Urutan kolom CSV dan baris overlay
+PHASES = ("events", "update", "physics", "table", "balls", "cue", "hud", "ui", "overlay", "wait", "flip", "sound")
+
+
+def percentile(sorted_values, p):
+    """Persentil nearest-rank dari list yang sudah terurut."""
+    if not sorted_values: return 0.0
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """
+    Profiler per fase frame untuk GameManager.run, tanpa profiler eksternal.
+
+    Setiap fase ditandai dengan lap(nama): waktu sejak tanda terakhir ditambahkan ke fase
+    tersebut, jadi jumlah semua fase = waktu frame. substep() dipanggil setiap tick fisika
+    (jumlah tick dan tick terlama ikut dicatat). Hanya aktif jika overlay (F3) atau
+    streaming CSV (F4) menyala; selain itu lap() langsung kembali.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY):
+        self.overlay = PROFILER_OVERLAY
+        self.csv_file = None
+        self.csv_writer = None
+        self.warning = None  # pesan gagal membuka CSV, tampil di overlay
+        self.history = deque(maxlen=history)  # (frame_ms, work_ms, {fase: ms}, ticks)
+        self.frame_index = 0
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.ticks = 0
+        self.tick_max = 0.0
+        self.frame_start = self.mark = time.perf_counter()
+        self.start_time = self.frame_start
+        self.lines = []  # surface teks statistik, diperbarui tiap PROFILER_REFRESH frame
+        self.rect = pygame.Rect(SCREEN_WIDTH - 390, SCREEN_HEIGHT - 200, 380, 190)
+        self.panel = None
+
+    @property
+    def enabled(self):
+        return self.overlay or self.csv_file is not None
+
+    def begin_frame(self):
+        if self.enabled: self._reset_frame()
+
+    def _reset_frame(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.ticks = 0
+        self.tick_max = 0.0
+        self.frame_start = self.mark = time.perf_counter()
+
+    def lap(self, phase):
+        """Menutup fase `phase` (waktu sejak lap sebelumnya). Mengembalikan durasi dalam detik."""
+        if not self.enabled: return 0.0
+        now = time.perf_counter()
+        elapsed = now - self.mark
+        self.times[phase] += elapsed
+        self.mark = now
+        return elapsed
+
+    def substep(self):
+        """Menutup satu tick fisika."""
+        if not self.enabled: return
+        elapsed = self.lap("physics")
+        self.ticks += 1
+        self.tick_max = max(self.tick_max, elapsed)
+
+    def end_frame(self, state):
+        if not self.enabled: return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        phases = {phase: t * 1000 for phase, t in self.times.items()}
+        work_ms = frame_ms - phases["wait"]
+        self.history.append((frame_ms, work_ms, phases, self.ticks))
+        self.frame_index += 1
+
+        if self.csv_writer:
+            self.csv_writer.writerow(
+                [self.frame_index, f"{self.frame_start - self.start_time:.4f}", state,
+                 f"{frame_ms:.3f}", f"{work_ms:.3f}", self.ticks, f"{self.tick_max * 1000:.3f}"]
+                + [f"{phases[phase]:.3f}" for phase in PHASES])
+
+    def toggle_overlay(self):
+        was_enabled = self.enabled
+        self.overlay = not self.overlay
+        self.lines = []
+        if not was_enabled: self._reset_frame()  # dinyalakan di tengah frame
+
+    def toggle_csv(self):
+        """
+        Mulai/berhenti menulis timing per frame ke CSV. Mengembalikan path file, atau None saat
+        berhenti maupun gagal (direktori tidak bisa ditulis; pesan disimpan di self.warning).
+        """
+        if self.csv_file:
+            self.close()
+            return None
+        path = os.path.join(PROFILER_CSV_DIR, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+        try:
+            os.makedirs(PROFILER_CSV_DIR, exist_ok=True)
+            csv_file = open(path, "w", newline="")
+        except OSError as e:
+            print(f"Gagal membuat CSV profil: {e}")
+            self.warning = f"CSV gagal: {e.strerror or e}"
+            self.lines = []
+            return None
+        if not self.enabled: self._reset_frame()
+        self.warning = None
+        self.csv_file = csv_file
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame", "time_s", "state", "frame_ms", "work_ms", "ticks", "tick_max_ms"]
+                                 + [f"{phase}_ms" for phase in PHASES])
+        return path
+
+    def stats(self):
+        """p50/p95/p99 waktu frame dan waktu kerja (tanpa menunggu clock.tick) atas history."""
+        frames = sorted(entry[0] for entry in self.history)
+        work = sorted(entry[1] for entry in self.history)
+        return {name: tuple(percentile(values, p) for p in (50, 95, 99))
+                for name, values in (("frame", frames), ("work", work))}
+
+    def _render_lines(self, font):
+        n = len(self.history) or 1
+        avg = {phase: sum(entry[2][phase] for entry in self.history) / n for phase in PHASES}
+        ticks = sum(entry[3] for entry in self.history) / n
+        stats = self.stats()
+        texts = [
+            "Frame  p50 {:.1f}  p95 {:.1f}  p99 {:.1f} ms".format(*stats["frame"]),
+            "Work   p50 {:.1f}  p95 {:.1f}  p99 {:.1f} ms".format(*stats["work"]),
+            f"events {avg['events']:.2f}  update {avg['update']:.2f}  physics {avg['physics']:.2f} ({ticks:.1f} tick)",
+            f"table {avg['table']:.2f}  balls {avg['balls']:.2f}  cue {avg['cue']:.2f}  hud {avg['hud']:.2f}",
+            f"ui {avg['ui']:.2f}  flip {avg['flip']:.2f}  wait {avg['wait']:.2f}  CSV {'ON' if self.csv_file else 'OFF'}",
+        ]
+        self.lines = [font.render(text, True, GREEN) for text in texts]
+        if self.warning: self.lines.append(font.render(self.warning, True, RED))
+
+    def draw(self, surface, font):
+        """Overlay: grafik waktu frame bergulir (abu-abu = frame, hijau = kerja) dan statistik fase (ms)."""
+        if self.panel is None:
+            self.panel = pygame.Surface(self.rect.size)
+            self.panel.set_alpha(190)
+            self.panel.fill(BLACK)
+        surface.blit(self.panel, self.rect)
+        if not self.lines or self.frame_index % PROFILER_REFRESH == 0:
+            self._render_lines(font)
+
+        x, y = self.rect.x + 8, self.rect.y + 6
+        for line in self.lines:
+            surface.blit(line, (x, y))
+            y += 18
+
+        # Grafik: tinggi penuh = 2 frame target, garis kuning = anggaran satu frame
+        graph = pygame.Rect(x, y + 4, self.rect.w - 16, self.rect.bottom - y - 12)
+        budget = 1000 / FPS
+        scale = graph.h / (budget * 2)
+        pygame.draw.line(surface, YELLOW, (graph.x, graph.bottom - budget * scale), (graph.right, graph.bottom - budget * scale))
+        if len(self.history) > 1:
+            step = graph.w / (self.history.maxlen - 1)
+            for index, color in ((0, GREY), (1, GREEN)):
+                points = [(graph.x + i * step, graph.bottom - min(entry[index] * scale, graph.h))
+                          for i, entry in enumerate(self.history)]
+                pygame.draw.lines(surface, color, False, points)
+
+    def close(self):
+        if self.csv_file:
+            self.csv_file.close()
+        self.csv_file = None
+        self.csv_writer = None
@@ -0,0 +1,532 @@
+import math
+from config import *
+from physics import PhysicsEngine
+from broadphase import SpatialHash, sweep_and_prune
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def ball_type(number):
+    """Menentukan jenis bola 8-ball dari nomornya."""
+    if number == 0: return "cue"
+    elif number == 8: return "eight"
+    elif 1 <= number <= 7: return "solid"
+    return "stripe"
+
+
+def table_bounds(x=TABLE_X, y=TABLE_Y, width=PLAY_WIDTH, height=PLAY_HEIGHT):
+    """Batas area permainan (left, top, right, bottom)."""
+    return (x, y, x + width, y + height)
+
+
+def table_pockets(x=TABLE_X, y=TABLE_Y, width=PLAY_WIDTH, height=PLAY_HEIGHT):
+    """Posisi keenam lubang meja."""
+    return [
+        (x, y),
+        (x + width // 2, y - 5),
+        (x + width, y),
+        (x, y + height),
+        (x + width // 2, y + height + 5),
+        (x + width, y + height)
+    ]
+
+
+def rack_layout(start_x=TABLE_X + 600, start_y=TABLE_Y + PLAY_HEIGHT // 2):
+    """Susunan segitiga 15 bola untuk break, berupa list (nomor, x, y)."""
+    layout = []
+    number = 1
+    for col in range(5):
+        for row in range(col + 1):
+            x = start_x + (col * (BALL_RADIUS * 2 + 1))
+            y = start_y - (col * BALL_RADIUS) + (row * (BALL_RADIUS * 2 + 1))
+            layout.append((number, x, y))
+            number += 1
+    return layout
+
+
+class Vec:
+    """Vektor 2D minimal (hanya x dan y) agar simulasi tidak bergantung pada pygame."""
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        return f"Vec({self.x:.2f}, {self.y:.2f})"
+
+
+class Body:
+    """Bola headless untuk CI, benchmark, dan AI (tanpa window / mixer)."""
+    __slots__ = ("pos", "velocity", "radius", "friction", "potted", "number", "type")
+
+    def __init__(self, x, y, number=0):
+        self.pos = Vec(x, y)
+        self.velocity = Vec(0.0, 0.0)
+        self.radius = BALL_RADIUS
+        self.friction = BALL_FRICTION
+        self.potted = False
+        self.number = number
+        self.type = ball_type(number)
+
+    def hit(self, force, angle):
+        self.velocity.x += math.cos(angle) * force
+        self.velocity.y += math.sin(angle) * force
+
+
+class Simulation:
+    """
+    Inti simulasi fisika yang tidak bergantung pada pygame.
+    Menyimpan daftar bola, batas meja dan lubang, lalu memajukan keadaan per frame:
+    1. Integrasi posisi dalam beberapa substep.
+    2. Pantulan bantalan (cushion) dan deteksi bola masuk lubang.
+    3. Tumbukan antar bola lewat PhysicsEngine.
+    4. Gesekan di akhir frame.
+
+    Bola cukup memiliki atribut pos/velocity (dengan .x dan .y), radius,
+    friction dan potted, sehingga Ball (pygame) maupun Body (headless) bisa dipakai.
+    """
+
+    def __init__(self, balls, bounds=None, pockets=None, steps=PHYSICS_STEPS):
+        self.balls = balls
+        self.bounds = bounds if bounds is not None else table_bounds()
+        self.pockets = pockets if pockets is not None else table_pockets()
+        self.steps = steps
+        self.adaptive = ADAPTIVE_SUBSTEPS
+        self.contact_solver = CONTACT_SOLVER
+        self.frame = 0
+        # Naik setiap kali posisi bola bisa berubah; dipakai untuk invalidasi cache (mis. prediksi bidikan)
+        self.version = 0
+
+        # Statistik substep: jumlah pada frame terakhir dan total sejak awal
+        self.last_substeps = 0
+        self.substeps_taken = 0
+        self.contact_passes = 0
+
+        # Active set: indeks bola yang bergerak. Bola diam "tidur" sampai tersentuh bola lain.
+        self.index_of = {ball: i for i, ball in enumerate(balls)}
+        self.awake = {i for i, b in enumerate(balls) if not b.potted and (b.velocity.x or b.velocity.y)}
+        self._fell_asleep = set()
+        self._active = None  # cache indeks bangun yang terurut; None = perlu dibangun ulang
+
+        if len(balls) > BROADPHASE_MIN_BALLS:
+            self.broadphase = SpatialHash()
+            self._all_pairs = None
+        else:
+            self.broadphase = None
+            self._all_pairs = [(i, j) for i in range(len(balls)) for j in range(i + 1, len(balls))]
+
+        # Callback opsional: on_pot(ball) dan on_collision(ball1, ball2, impact)
+        self.on_pot = None
+        self.on_collision = None
+
+    @classmethod
+    def break_shot(cls, cue_pos=(TABLE_X + 200, TABLE_Y + PLAY_HEIGHT // 2), **kwargs):
+        """Membuat simulasi headless dengan posisi awal standar (bola putih + rack)."""
+        balls = [Body(cue_pos[0], cue_pos[1], 0)]
+        balls += [Body(x, y, number) for number, x, y in rack_layout()]
+        return cls(balls, **kwargs)
+
+    def strike(self, ball, force, angle):
+        """Memberikan impuls tembakan stik ke sebuah bola."""
+        ball.hit(force, angle)
+        self.wake(ball)
+
+    def wake(self, ball):
+        """Membangunkan bola yang kecepatan/posisinya diubah dari luar simulasi."""
+        if not ball.potted:
+            self._wake_index(self.index_of[ball])
+
+    def wake_all(self):
+        self.awake.update(i for i, b in enumerate(self.balls) if not b.potted)
+        self._active = None
+
+    def _wake_index(self, i):
+        if i not in self.awake:
+            self.awake.add(i)
+            self._active = None
+
+    def _sleep_index(self, i):
+        self.awake.discard(i)
+        self._active = None
+
+    def _active_indices(self):
+        """Indeks bola bangun dalam urutan daftar bola; hanya dibangun ulang saat active set berubah."""
+        if self._active is None:
+            self._active = sorted(self.awake)
+        return self._active
+
+    def step(self):
+        """Memajukan simulasi satu frame. Mengembalikan jumlah bola yang masih bergerak."""
+        self.frame += 1
+        awake = self.awake
+        if not awake:
+            self.last_substeps = 0
+            return 0
+
+        self.version += 1
+        balls = self.balls
+        max_speed = 0.0
+        for i in self._active_indices():
+            v = balls[i].velocity
+            speed = math.hypot(v.x, v.y)
+            if speed > max_speed: max_speed = speed
+        steps = self._substeps_for(max_speed)
+        inv_steps = 1.0 / steps
+
+        for _ in range(steps):
+            for i in self._active_indices():
+                ball = balls[i]
+                pos, v = ball.pos, ball.velocity
+                pos.x += v.x * inv_steps
+                pos.y += v.y * inv_steps
+                self._check_cushion(ball)
+                if self._check_pocket(ball):
+                    self._sleep_index(i)
+                    self._fell_asleep.add(i)  # update broadphase berikutnya mengeluarkannya dari grid
+                    if self.on_pot:
+                        self.on_pot(ball)
+                        # Bola bisa dikembalikan ke meja oleh callback (mis. bola putih)
+                        if not ball.potted: self._wake_index(i)
+
+            if self.contact_solver == "batched":
+                self._solve_contacts()
+            else:
+                self._resolve_pairs()
+
+        return self._apply_friction()
+
+    def _resolve_pairs(self):
+        """Tumbukan diselesaikan satu pasangan demi satu sesuai urutan daftar bola."""
+        awake, balls = self.awake, self.balls
+        for i, j in self._candidate_pairs():
+            if i not in awake and j not in awake: continue
+            b1 = balls[i]
+            b2 = balls[j]
+            if PhysicsEngine.resolve_collision(b1, b2):
+                self._wake_index(i)
+                self._wake_index(j)
+                if self.on_collision:
+                    impact = math.hypot(b1.velocity.x - b2.velocity.x, b1.velocity.y - b2.velocity.y)
+                    self.on_collision(b1, b2, impact)
+
+    def _solve_contacts(self):
+        """Semua kontak yang melibatkan bola bangun diselesaikan serentak oleh PhysicsEngine."""
+        balls = self.balls
+        contacts, impulses, passes = PhysicsEngine.solve_contacts(
+            balls, self._candidate_pairs(), CONTACT_ITERATIONS, active=self.awake)
+        self.contact_passes += passes
+        for i, j in contacts:
+            self._wake_index(i)
+            self._wake_index(j)
+        if self.on_collision:
+            for i, j in impulses:
+                b1, b2 = balls[i], balls[j]
+                impact = math.hypot(b1.velocity.x - b2.velocity.x, b1.velocity.y - b2.velocity.y)
+                self.on_collision(b1, b2, impact)
+
+    def _substeps_for(self, max_speed):
+        """
+        Jumlah substep frame ini (syarat CFL), dibatasi oleh self.steps. Tumbukan bergantung pada
+        kecepatan mendekat antar pasangan, yang bisa mencapai 2 * max_speed (dua bola tercepat
+        berhadapan), jadi jarak relatif per substep tidak boleh melebihi SUBSTEP_CFL * BALL_RADIUS.
+        """
+        if self.adaptive:
+            closing_speed = 2 * max_speed
+            steps = min(self.steps, max(1, math.ceil(closing_speed / (SUBSTEP_CFL * BALL_RADIUS))))
+        else:
+            steps = self.steps
+        self.last_substeps = steps
+        self.substeps_taken += steps
+        return steps
+
+    def run_until_rest(self, max_frames=100000):
+        """Menjalankan simulasi sampai semua bola diam. Mengembalikan jumlah frame yang dijalankan."""
+        frames = 0
+        while frames < max_frames:
+            frames += 1
+            if self.step() == 0:
+                break
+        return frames
+
+    def is_moving(self):
+        return bool(self.awake)
+
+    def positions(self):
+        """Posisi (x, y) semua bola dalam urutan daftar bola."""
+        return [(b.pos.x, b.pos.y) for b in self.balls]
+
+    def sync(self):
+        """Memastikan objek bola memuat state terbaru sebelum dibaca (mis. untuk render). Backend ini langsung memakai objek bola."""
+
+    def _candidate_pairs(self):
+        if self.broadphase is None:
+            return self._all_pairs
+        # Hanya bola yang bisa berpindah sel: yang bangun dan yang baru saja tertidur
+        self.broadphase.update(self.balls, self.awake)
+        if self._fell_asleep:
+            self.broadphase.update(self.balls, self._fell_asleep)
+            self._fell_asleep.clear()
+        return self.broadphase.candidate_pairs()
+
+    def _apply_friction(self):
+        """Gesekan untuk bola yang bangun; bola yang melambat di bawah STOP_SPEED ditidurkan."""
+        balls = self.balls
+        for i in self._active_indices():
+            ball = balls[i]
+            v = ball.velocity
+            if math.hypot(v.x, v.y) > STOP_SPEED:
+                v.x *= ball.friction
+                v.y *= ball.friction
+            else:
+                v.x = 0
+                v.y = 0
+                self._sleep_index(i)
+                self._fell_asleep.add(i)
+        return len(self.awake)
+
+    def _check_cushion(self, ball):
+        left, top, right, bottom = self.bounds
+        pos, vel, r = ball.pos, ball.velocity, ball.radius
+        collided = False
+        if pos.x - r < left:
+            pos.x = left + r
+            vel.x *= -CUSHION_BOUNCE
+            collided = True
+        elif pos.x + r > right:
+            pos.x = right - r
+            vel.x *= -CUSHION_BOUNCE
+            collided = True
+
+        if pos.y - r < top:
+            pos.y = top + r
+            vel.y *= -CUSHION_BOUNCE
+            collided = True
+        elif pos.y + r > bottom:
+            pos.y = bottom - r
+            vel.y *= -CUSHION_BOUNCE
+            collided = True
+        return collided
+
+    def _check_pocket(self, ball):
+        for px, py in self.pockets:
+            if math.hypot(ball.pos.x - px, ball.pos.y - py) < POCKET_RADIUS:
+                ball.potted = True
+                ball.velocity.x = 0
+                ball.velocity.y = 0
+                return True
+        return False
+
+
+class NumpySimulation(Simulation):
+    """
+    Backend opsional berbasis NumPy (struct-of-arrays).
+    Posisi, kecepatan, radius dan status potted semua bola disimpan dalam array kontigu,
+    sehingga integrasi, gesekan, cushion, lubang dan deteksi tumbukan dihitung
+    untuk semua bola sekaligus. Daftar bola dianggap tetap setelah simulasi dibuat.
+
+    Selama bola bergerak, array adalah sumber kebenaran. Objek bola hanya diperbarui lewat
+    sync() (dipanggil renderer), sebelum callback, dan saat semua bola berhenti. Perubahan dari
+    luar masuk lewat strike()/wake()/wake_all(), yang memuat ulang bola dari objeknya.
+    """
+
+    def __init__(self, balls, bounds=None, pockets=None, steps=PHYSICS_STEPS):
+        if np is None:
+            raise ImportError("NumpySimulation membutuhkan numpy")
+        super().__init__(balls, bounds, pockets, steps)
+        n = len(balls)
+        # Lubang disimpan sebagai titik tetap setelah bola, jadi cek lubang ikut satu perhitungan jarak pasangan
+        pockets = np.array(self.pockets, dtype=float).reshape(-1, 2)
+        self._points = np.vstack((np.zeros((n, 2)), pockets))
+        self.pos = self._points[:n]
+        self.vel = np.zeros((n, 2))
+        self.potted = np.zeros(n, dtype=bool)
+        self.radius = np.array([b.radius for b in balls], dtype=float)
+        self.friction = np.array([b.friction for b in balls], dtype=float)
+        self._radius_list = self.radius.tolist()
+        self._moved = np.zeros(n, dtype=bool)  # bola yang array-nya berubah sejak sync terakhir
+        for i in range(n):
+            self._load_one(i)
+
+        left, top, right, bottom = self.bounds
+        self._lower = np.column_stack((left + self.radius, top + self.radius))
+        self._upper = np.column_stack((right - self.radius, bottom - self.radius))
+        # Pasangan (bola, lubang): indeks lubang di _points dimulai dari n
+        self._pocket_i = np.repeat(np.arange(n), len(pockets))
+        self._pocket_j = np.tile(np.arange(n, n + len(pockets)), n)
+        self._pocket_reach2 = np.full(len(self._pocket_i), float(POCKET_RADIUS ** 2))
+        # Grid dict tidak dipakai di sini; tumbukan memakai sweep-and-prune tervektorisasi
+        self.broadphase = None
+        self._sweep = n > BROADPHASE_MIN_BALLS
+        self._max_reach = 2 * float(self.radius.max()) if n else 0.0
+        if not self._sweep:
+            pi, pj = np.triu_indices(n, 1)
+            self._pair_i = np.concatenate((pi, self._pocket_i))
+            self._pair_j = np.concatenate((pj, self._pocket_j))
+            self._pair_reach2 = np.concatenate(((self.radius[pi] + self.radius[pj]) ** 2, self._pocket_reach2))
+
+    def wake(self, ball):
+        self._load_one(self.index_of[ball])
+        super().wake(ball)
+
+    def wake_all(self):
+        for i in range(len(self.balls)):
+            self._load_one(i)
+        super().wake_all()
+
+    def positions(self):
+        return [tuple(p) for p in self.pos.tolist()]
+
+    def sync(self):
+        """Menyalin posisi/kecepatan bola yang berubah dari array ke objek bolanya."""
+        moved = self._moved.nonzero()[0].tolist()
+        if not moved: return
+        self._moved[:] = False
+        pos, vel = self.pos.tolist(), self.vel.tolist()
+        for i in moved:
+            ball = self.balls[i]
+            ball.pos.x, ball.pos.y = pos[i]
+            ball.velocity.x, ball.velocity.y = vel[i]
+
+    def step(self):
+        if not self.awake:
+            self.frame += 1
+            self.last_substeps = 0
+            return 0
+        self.version += 1
+        pos, vel = self.pos, self.vel
+        self._moved[self._active_indices()] = True
+        steps = self._substeps_for(float(np.hypot(vel[:, 0], vel[:, 1]).max()))
+
+        inv_steps = 1.0 / steps
+
+        for _ in range(steps):
+            # Bola yang sudah masuk lubang selalu berkecepatan nol dan berada di dalam batas meja
+            pos += vel * inv_steps
+
+            out = (pos < self._lower) | (pos > self._upper)
+            if out.any():
+                np.clip(pos, self._lower, self._upper, out=pos)
+                vel[out] *= -CUSHION_BOUNCE
+
+            self._collide()
+
+        self.frame += 1
+        return self._friction_pass()
+
+    def _collide(self):
+        """
+        Lubang dan tumbukan: satu kali hitung jarak untuk semua pasangan bola-bola dan bola-lubang
+        (vektor), lalu bola yang masuk lubang diproses lebih dulu dan pasangan bola yang overlap
+        diselesaikan dengan float Python biasa; hasilnya ditulis kembali ke array sekaligus.
+        """
+        if not self._sweep:
+            pi, pj, reach2 = self._pair_i, self._pair_j, self._pair_reach2
+        else:
+            pi, pj = sweep_and_prune(self.pos, self._max_reach)
+            reach2 = np.concatenate(((self.radius[pi] + self.radius[pj]) ** 2, self._pocket_reach2))
+            pi = np.concatenate((pi, self._pocket_i))
+            pj = np.concatenate((pj, self._pocket_j))
+        delta = self._points[pi] - self._points[pj]
+        dist2 = np.einsum('ij,ij->i', delta, delta)
+        hits = (dist2 < reach2).nonzero()[0]
+        if not len(hits): return
+
+        n = len(self.balls)
+        contacts = []
+        for i, j in zip(pi[hits].tolist(), pj[hits].tolist()):
+            if j < n:
+                contacts.append((i, j))
+            elif not self.potted[i]:
+                self.potted[i] = True
+                self.vel[i] = 0
+                self._pot(i)
+        if not contacts: return
+
+        pos, vel = self.pos.tolist(), self.vel.tolist()
+        radius, potted = self._radius_list, self.potted.tolist()
+        touched = set()
+        for i, j in contacts:
+            if potted[i] or potted[j]: continue
+            p1, p2 = pos[i], pos[j]
+            dx = p1[0] - p2[0]
+            dy = p1[1] - p2[1]
+            distance = math.hypot(dx, dy)
+            reach = radius[i] + radius[j]
+            # Pasangan sebelumnya bisa saja sudah memisahkan bola ini
+            if distance >= reach: continue
+            if distance == 0: distance = 0.001
+            nx = dx / distance
+            ny = dy / distance
+
+            v1, v2 = vel[i], vel[j]
+            dvn = (v2[0] - v1[0]) * nx + (v2[1] - v1[1]) * ny
+            v1[0] += dvn * nx
+            v1[1] += dvn * ny
+            v2[0] -= dvn * nx
+            v2[1] -= dvn * ny
+
+            overlap = (reach - distance) / 2.0
+            p1[0] += nx * overlap
+            p1[1] += ny * overlap
+            p2[0] -= nx * overlap
+            p2[1] -= ny * overlap
+            touched.add(i)
+            touched.add(j)
+
+            if self.on_collision:
+                b1, b2 = self.balls[i], self.balls[j]
+                b1.pos.x, b1.pos.y = p1
+                b1.velocity.x, b1.velocity.y = v1
+                b2.pos.x, b2.pos.y = p2
+                b2.velocity.x, b2.velocity.y = v2
+                self.on_collision(b1, b2, math.hypot(v1[0] - v2[0], v1[1] - v2[1]))
+
+        if touched:
+            index = list(touched)
+            self.pos[index] = [pos[i] for i in index]
+            self.vel[index] = [vel[i] for i in index]
+            self._moved[index] = True
+
+    def _friction_pass(self):
+        active = ~self.potted
+        speed = np.hypot(self.vel[:, 0], self.vel[:, 1])
+        moving = active & (speed > STOP_SPEED)
+        self.vel[moving] *= self.friction[moving, None]
+        self.vel[active & ~moving] = 0
+        self.awake = set(moving.nonzero()[0].tolist())
+        self._active = None
+        if not self.awake: self.sync()  # Semua diam: objek bola kembali lengkap
+        return len(self.awake)
+
+    def _pot(self, i):
+        """Sinkronkan bola ke objeknya sebelum callback, karena on_pot bisa mengubahnya (mis. reset bola putih)."""
+        ball = self.balls[i]
+        ball.pos.x, ball.pos.y = self.pos[i].tolist()
+        ball.velocity.x, ball.velocity.y = self.vel[i].tolist()
+        ball.potted = True
+        if self.on_pot:
+            self.on_pot(ball)
+        self._load_one(i)
+
+    def _load_one(self, i):
+        ball = self.balls[i]
+        self.pos[i] = (ball.pos.x, ball.pos.y)
+        self.vel[i] = (ball.velocity.x, ball.velocity.y)
+        self.potted[i] = ball.potted
+
+
+def create_simulation(balls, bounds=None, pockets=None, backend=PHYSICS_BACKEND, mode=PHYSICS_MODE):
+    """
+    Membuat simulasi sesuai konfigurasi. Mode "event" memakai EventSimulation;
+    backend "numpy" kembali ke backend Python jika numpy tidak tersedia.
+    """
+    if mode == "event":
+        from event_simulation import EventSimulation
+        return EventSimulation(balls, bounds, pockets)
+    if backend == "numpy" and np is not None:
+        return NumpySimulation(balls, bounds, pockets)
+    return Simulation(balls, bounds, pockets)
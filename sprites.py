@@ -0,0 +1,65 @@
+import pygame # type: ignore
+from config import *
+from ball import Ball
+
+HUD_BALL_RADIUS = 10
+
+
+class BallSprites:
+    """
+    Atlas sprite bola yang dirender sekali saat startup.
+    Setiap nomor bola punya dua sprite: ukuran meja (badan, stripe, lingkaran nomor, highlight)
+    dan ukuran HUD (daftar sisa bola pemain). Menggambar bola cukup satu blit per bola,
+    dikumpulkan dalam satu panggilan Surface.blits.
+    """
+
+    def __init__(self, ball_colors, ball_font, hud_font):
+        self.table = {}
+        self.hud = {}
+        self.table_offset = BALL_RADIUS + 1
+        self.hud_offset = HUD_BALL_RADIUS + 1
+
+        colors = dict(ball_colors)
+        colors[0] = WHITE
+        for number, color in colors.items():
+            self.table[number] = self._render_table_ball(number, color, ball_font)
+            if number > 0:
+                self.hud[number] = self._render_hud_ball(number, color, hud_font)
+
+    def _render_table_ball(self, number, color, font):
+        # Memakai Ball.draw apa adanya agar tampilan sprite identik dengan gambar langsung
+        size = self.table_offset * 2
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        Ball(self.table_offset, self.table_offset, color, number).draw(surf, font)
+        return surf
+
+    def _render_hud_ball(self, number, color, font):
+        size = self.hud_offset * 2
+        c = self.hud_offset
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (c, c), HUD_BALL_RADIUS)
+        if number > 8:
+            pygame.draw.circle(surf, WHITE, (c, c), 7)
+            pygame.draw.rect(surf, color, (c - 8, c - 3, 16, 6))
+        txt = font.render(str(number), True, BLACK)
+        surf.blit(txt, txt.get_rect(center=(c, c)))
+        return surf
+
+    def draw_balls(self, surface, balls, positions=None):
+        """
+        Menggambar semua bola di meja dengan satu batch blit.
+        positions: titik pusat render per bola (mis. hasil interpolasi); default posisi fisika.
+        """
+        off = self.table_offset
+        table = self.table
+        if positions is None:
+            positions = [(b.pos.x, b.pos.y) for b in balls]
+        surface.blits([(table[b.number], (int(x) - off, int(y) - off))
+                       for b, (x, y) in zip(balls, positions) if not b.potted], doreturn=False)
+
+    def draw_hud_balls(self, surface, numbers, positions):
+        """Menggambar bola kecil HUD; positions berisi titik pusat masing-masing bola."""
+        off = self.hud_offset
+        hud = self.hud
+        surface.blits([(hud[num], (x - off, y - off)) for num, (x, y) in zip(numbers, positions)],
+                      doreturn=False)
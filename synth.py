@@ -0,0 +1,177 @@
+import array
+import hashlib
+import math
+import os
+from config import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WAVEFORMS = ("square", "sine", "triangle", "saw", "noise")
+ENVELOPES = ("flat", "fade", "decay")
+
+FADE_IN = 0.005  # detik
+FADE_OUT = 0.02
+DECAY_RATE = 6.0  # amplitudo turun ke e^-6 di akhir suara
+CACHE_FORMAT = 2  # naikkan jika rumus sintesis berubah agar cache lama tidak terpakai
+PCM_MIN, PCM_MAX = -32768, 32767  # rentang sampel 16-bit; hasil di luar rentang dipotong
+
+# Noise: hash integer 32-bit per indeks sampel (lowbias32), jadi jalur NumPy dan Python
+# menghasilkan buffer yang sama persis untuk seed yang sama
+NOISE_SEED_MUL = 0x9E3779B9
+NOISE_MUL1 = 0x7FEB352D
+NOISE_MUL2 = 0x846CA68B
+MASK32 = 0xFFFFFFFF
+
+
+def sample_count(duration, sample_rate=SAMPLE_RATE):
+    return int(sample_rate * duration)
+
+
+def synthesize(waveform, frequency, duration, amplitude=4000, envelope="flat", sample_rate=SAMPLE_RATE):
+    """
+    Mensintesis satu suara mono PCM 16-bit (urutan byte sistem).
+    Memakai NumPy jika tersedia (seluruh buffer dihitung sekaligus); tanpa NumPy
+    jatuh ke loop Python yang setara. Mengembalikan bytes.
+    """
+    if waveform not in WAVEFORMS: raise ValueError(f"Waveform tidak dikenal: {waveform}")
+    if envelope not in ENVELOPES: raise ValueError(f"Envelope tidak dikenal: {envelope}")
+    n = sample_count(duration, sample_rate)
+    if np is not None:
+        return _synthesize_numpy(waveform, frequency, n, amplitude, envelope, sample_rate)
+    return _synthesize_python(waveform, frequency, n, amplitude, envelope, sample_rate)
+
+
+def _synthesize_numpy(waveform, frequency, n, amplitude, envelope, sample_rate):
+    i = np.arange(n, dtype=np.float64)
+    period = sample_rate / frequency
+    if waveform == "square":
+        # Sama persis dengan beep lama: tanda berganti setiap setengah periode
+        wave = np.where((i // (period / 2)) % 2 == 0, 1.0, -1.0)
+    elif waveform == "sine":
+        wave = np.sin(2 * np.pi * i / period)
+    elif waveform == "triangle":
+        wave = 2.0 * np.abs(2.0 * ((i / period) % 1.0) - 1.0) - 1.0
+    elif waveform == "saw":
+        wave = 2.0 * ((i / period) % 1.0) - 1.0
+    else:
+        wave = _noise_numpy(int(frequency), n)
+
+    wave *= amplitude
+    if envelope != "flat":
+        wave *= _envelope_numpy(envelope, n, sample_rate)
+    return np.clip(np.round(wave), PCM_MIN, PCM_MAX).astype(np.int16).tobytes()
+
+
+def _noise_numpy(seed, n):
+    # Perkalian uint32 sengaja overflow (modulo 2^32), sama dengan & MASK32 di jalur Python
+    x = np.arange(n, dtype=np.uint32) + np.uint32((seed * NOISE_SEED_MUL) & MASK32)
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(NOISE_MUL1)
+    x ^= x >> np.uint32(15)
+    x *= np.uint32(NOISE_MUL2)
+    x ^= x >> np.uint32(16)
+    return x / 2.0 ** 31 - 1.0
+
+
+def _envelope_numpy(envelope, n, sample_rate):
+    if envelope == "decay":
+        return np.exp(-DECAY_RATE * np.arange(n) / max(n, 1))
+    gain = np.ones(n)
+    fade_in = min(int(FADE_IN * sample_rate), n)
+    fade_out = min(int(FADE_OUT * sample_rate), n)
+    if fade_in: gain[:fade_in] = np.linspace(0.0, 1.0, fade_in, endpoint=False)
+    if fade_out: gain[n - fade_out:] *= np.linspace(1.0, 0.0, fade_out)
+    return gain
+
+
+def _synthesize_python(waveform, frequency, n, amplitude, envelope, sample_rate):
+    period = sample_rate / frequency
+    half = period / 2
+    if waveform == "square":
+        wave = [1.0 if (i // half) % 2 == 0 else -1.0 for i in range(n)]
+    elif waveform == "sine":
+        step = 2 * math.pi / period
+        wave = [math.sin(i * step) for i in range(n)]
+    elif waveform == "triangle":
+        wave = [2.0 * abs(2.0 * ((i / period) % 1.0) - 1.0) - 1.0 for i in range(n)]
+    elif waveform == "saw":
+        wave = [2.0 * ((i / period) % 1.0) - 1.0 for i in range(n)]
+    else:
+        offset = (int(frequency) * NOISE_SEED_MUL) & MASK32
+        wave = [_noise_hash((i + offset) & MASK32) / 2.0 ** 31 - 1.0 for i in range(n)]
+
+    if envelope == "flat":
+        samples = [round(w * amplitude) for w in wave]
+    else:
+        samples = [round(w * amplitude * g) for w, g in zip(wave, _envelope_python(envelope, n, sample_rate))]
+    return array.array('h', [min(max(v, PCM_MIN), PCM_MAX) for v in samples]).tobytes()
+
+
+def _noise_hash(x):
+    x ^= x >> 16
+    x = (x * NOISE_MUL1) & MASK32
+    x ^= x >> 15
+    x = (x * NOISE_MUL2) & MASK32
+    x ^= x >> 16
+    return x
+
+
+def _envelope_python(envelope, n, sample_rate):
+    if envelope == "decay":
+        return [math.exp(-DECAY_RATE * i / max(n, 1)) for i in range(n)]
+    fade_in = min(int(FADE_IN * sample_rate), n)
+    fade_out = min(int(FADE_OUT * sample_rate), n)
+    gain = [1.0] * n
+    for i in range(fade_in):
+        gain[i] = i / fade_in
+    for k in range(fade_out):
+        gain[n - fade_out + k] *= 1.0 - k / max(fade_out - 1, 1)
+    return gain
+
+
+class WaveCache:
+    """
+    Cache buffer PCM hasil sintesis di disk, satu file per kombinasi parameter.
+    Pemuatan memakai readinto ke bytearray yang langsung diberikan ke mixer lewat
+    buffer protocol, tanpa konversi perantara.
+    """
+
+    def __init__(self, directory=SOUND_CACHE_DIR, sample_rate=SAMPLE_RATE):
+        self.directory = directory
+        self.sample_rate = sample_rate
+
+    def load(self, waveform, frequency, duration, amplitude=4000, envelope="flat"):
+        params = (waveform, frequency, duration, amplitude, envelope)
+        expected = sample_count(duration, self.sample_rate) * 2
+        path = self._path(params)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == expected:
+                    buffer = bytearray(size)
+                    f.readinto(buffer)
+                    return buffer
+        except OSError:
+            pass
+
+        data = synthesize(*params, sample_rate=self.sample_rate)
+        self._store(path, data)
+        return data
+
+    def _path(self, params):
+        key = repr((CACHE_FORMAT, self.sample_rate, params)).encode()
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest()[:16] + ".pcm")
+
+    def _store(self, path, data):
+        """Tulis ke file sementara lalu rename, agar file cache tidak pernah setengah jadi."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Gagal menyimpan cache suara: {e}")
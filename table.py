@@ -1,5 +1,6 @@
 import pygame
 from config import *
+from simulation import table_bounds, table_pockets
 
 class Table:
     def __init__(self):
@@ -11,14 +12,8 @@ class Table:
         
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
         
-        self.pockets = [
-            (self.x, self.y),
-            (self.x + self.width // 2, self.y - 5),
-            (self.x + self.width, self.y),
-            (self.x, self.y + self.height),
-            (self.x + self.width // 2, self.y + self.height + 5),
-            (self.x + self.width, self.y + self.height)
-        ]
+        self.bounds = table_bounds(self.x, self.y, self.width, self.height)
+        self.pockets = table_pockets(self.x, self.y, self.width, self.height)
 
     def draw(self, surface):
         border_rect = (